@@ -0,0 +1,303 @@
+# Copyright (C) 2026 Adrien Vergé
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmarks of the hot paths of yamllint.
+
+Run from the root of the repository::
+
+ PYTHONPATH=. python benchmarks/benchmark.py [--repeat N] [CASE ...]
+
+Inputs are generated in memory. Each case prints the best of N runs of the
+current code and, where it makes sense, of the slower way it replaced, so that
+gains can be checked on a single checkout. The ``lint`` case only uses the
+public API: to compare two revisions, run it with ``PYTHONPATH`` pointing to
+each checkout. The script exits with 1 if the ``startup`` case is over its
+budget.
+"""
+
+import argparse
+import contextlib
+import functools
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+import yaml
+
+from yamllint import linter, parser
+from yamllint.config import YamlLintConfig
+from yamllint.rules import line_length
+from yamllint.rules.common import get_line_indent
+
+CASES = {}
+
+# Cumulative time of `import yamllint.cli`, above which the startup case fails
+STARTUP_BUDGET_MS = 100
+
+failures = []
+
+
+def case(function):
+    """Registers a benchmark case, a generator of (label, result) pairs."""
+    CASES[function.__name__.replace('_', '-')] = function
+    return function
+
+
+def best_of(repeat, function):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return f'{min(times) * 1000:10.1f} ms'
+
+
+def kubernetes_stream(documents=400):
+    """Returns a multi-document stream of Kubernetes-like manifests."""
+    return ''.join(
+        f'---\n'
+        f'apiVersion: apps/v1\n'
+        f'kind: Deployment\n'
+        f'metadata:\n'
+        f'  name: app-{i}\n'
+        f'  labels:\n'
+        f'    app: app-{i}\n'
+        f'    tier: backend\n'
+        f'spec:\n'
+        f'  replicas: {i % 5 + 1}\n'
+        f'  selector:\n'
+        f'    matchLabels:\n'
+        f'      app: app-{i}\n'
+        f'  template:\n'
+        f'    metadata:\n'
+        f'      labels:\n'
+        f'        app: app-{i}\n'
+        f'    spec:\n'
+        f'      containers:\n'
+        f'        - name: app\n'
+        f'          image: "registry.example.com/app:{i}.0"\n'
+        f'          args: [--port, "8080", --verbose]\n'
+        f'          ports:\n'
+        f'            - containerPort: 8080\n'
+        f'          env:\n'
+        f'            - name: MODE  # set at deployment\n'
+        f'              value: production\n'
+        for i in range(documents))
+
+
+@case
+def lint(repeat):
+    data = kubernetes_stream()
+    for extends in ('default', 'relaxed'):
+        conf = YamlLintConfig(f'extends: {extends}')
+        yield (f'linter.run(), {extends} configuration',
+               best_of(repeat, lambda conf=conf: list(linter.run(data, conf))))
+
+
+@case
+def single_pass(repeat):
+    data = kubernetes_stream()
+
+    def two_passes():
+        # Syntax check, then tokens for cosmetic rules
+        for _ in yaml.parse(data, Loader=yaml.BaseLoader):
+            pass
+        for _ in yaml.scan(data, Loader=yaml.BaseLoader):
+            pass
+
+    def one_pass(pure_python):
+        loader = parser.SinglePassLoader(data)
+        if pure_python:
+            loader.parsing = True  # don't skip the parser thanks to libyaml
+        while loader.pull_token():
+            loader.consumed_tokens.clear()
+        loader.finish_parsing()
+
+    yield 'yaml.parse() then yaml.scan()', best_of(repeat, two_passes)
+    yield ('SinglePassLoader, pure-Python parser',
+           best_of(repeat, lambda: one_pass(True)))
+    yield ('SinglePassLoader, parser skipped by libyaml',
+           best_of(repeat, lambda: one_pass(False)))
+
+
+@case
+def token_dispatch(repeat):
+    data = kubernetes_stream()
+    conf = YamlLintConfig('extends: default')
+
+    token_rules = [rule for rule in conf.enabled_rules(None)
+                   if rule.TYPE == 'token']
+    token_types = [type(token)
+                   for token in yaml.scan(data, Loader=yaml.BaseLoader)]
+
+    def run():
+        list(linter.get_cosmetic_problems(data, conf, None))
+
+    def calls():
+        return sum(1 for token_type in token_types for rule in token_rules
+                   if (not hasattr(rule, 'TOKEN_TYPES') or
+                       issubclass(token_type, rule.TOKEN_TYPES)))
+
+    yield 'rules called for the TOKEN_TYPES they handle', best_of(repeat, run)
+    yield '  calls to check()', f'{calls():10}'
+    with contextlib.ExitStack() as stack:
+        for rule in token_rules:
+            if hasattr(rule, 'TOKEN_TYPES'):
+                stack.enter_context(
+                    mock.patch.object(rule, 'TOKEN_TYPES', (yaml.Token,)))
+        yield 'rules called for every token', best_of(repeat, run)
+        yield '  calls to check()', f'{calls():10}'
+
+
+def without_slots(cls):
+    """Returns a copy of a class that stores its attributes in a __dict__."""
+    return type(cls.__name__, (), {
+        key: value for key, value in vars(cls).items()
+        if key not in ('__slots__', *cls.__slots__)})
+
+
+@case
+def slots(repeat):
+    data = kubernetes_stream()
+
+    def build():
+        elements = list(parser.token_or_comment_or_line_generator(data))
+        problems = [linter.LintProblem(line.line_no, 1, 'line too long')
+                    for line in parser.line_generator(data)]
+        return elements, problems
+
+    def memory():
+        tracemalloc.start()
+        try:
+            kept = build()  # noqa: F841
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    def measure():
+        yield '  time to build them', best_of(repeat, build)
+        yield '  memory held by them', f'{memory() / 2 ** 20:10.1f} MB'
+
+    yield 'Line, Token, Comment, LintProblem with __slots__', ''
+    yield from measure()
+    with contextlib.ExitStack() as stack:
+        for module, name in ((parser, 'Line'), (parser, 'Token'),
+                             (parser, 'Comment'), (linter, 'LintProblem')):
+            stack.enter_context(mock.patch.object(
+                module, name, without_slots(getattr(module, name))))
+        yield 'Line, Token, Comment, LintProblem with a __dict__', ''
+        yield from measure()
+
+
+@case
+def long_lines(repeat):
+    data = ''.join(
+        f'- name: artifact-{i}\n'
+        f'  url: https://downloads.example.com/releases/v{i}/artifact-{i}'
+        f'-linux-x86_64.tar.gz?checksum=sha256:{i:064x}\n'
+        f'  sha256: {i:0128x}\n'
+        f'  note: a description that is long enough to be broken on several'
+        f' lines, so that it is reported\n'
+        for i in range(10000))
+    conf = YamlLintConfig('extends: default\n'
+                          'rules:\n'
+                          '  line-length:\n'
+                          '    allow-non-breakable-inline-mappings: true\n')
+    rule_conf = conf.rules['line-length']
+    starts = parser.line_starts(data)
+
+    def run():
+        return list(line_length.check_buffer(rule_conf, data, starts))
+
+    yield ('inline mappings told apart by a regex',
+           best_of(repeat, run))
+    yield '  problems', f'{len(run()):10}'
+    with mock.patch.object(line_length, 'INLINE_MAPPING_PATTERN',
+                           re.compile('(?!)')):
+        yield ('a yaml.SafeLoader for each long line',
+               best_of(repeat, run))
+        yield '  problems', f'{len(run()):10}'
+
+
+@case
+def line_index(repeat):
+    def indents(tokens, line_starts):
+        for token in tokens:
+            get_line_indent(token, line_starts)
+
+    # Short block lines, then long flow sequences
+    for data in (kubernetes_stream(),
+                 ''.join(f'key{i}: [{", ".join(map(str, range(200)))}]\n'
+                         for i in range(200))):
+        tokens = list(yaml.scan(data, Loader=yaml.BaseLoader))
+        starts = parser.line_starts(data)
+        yield (f'get_line_indent() of {len(tokens)} tokens, index',
+               best_of(repeat, functools.partial(indents, tokens, starts)))
+        yield ('  searching back for a new line',
+               best_of(repeat, functools.partial(indents, tokens, None)))
+
+
+def import_times(code):
+    """Returns the cumulative import times of top-level modules, in ms."""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, check=True, text=True,
+                            encoding='utf-8').stderr
+    return {m.group(2): int(m.group(1)) / 1000 for m in re.finditer(
+        r'^import time: +\d+ \| +(\d+) \| (\S+)$', output, re.MULTILINE)}
+
+
+@case
+def startup(repeat):
+    lazy = min(import_times('import yamllint.cli')['yamllint.cli']
+               for _ in range(repeat))
+    later = min(sum(time for name, time in import_times(
+                    'import yamllint.cli, yamllint.config, yamllint.linter\n'
+                    'yamllint.config.YamlLintConfig("extends: default")'
+                    '.enabled_rules(None)\n').items()
+                    if name.startswith('yamllint.') and name != 'yamllint.cli')
+                for _ in range(repeat))
+    yield 'import yamllint.cli', f'{lazy:10.1f} ms'
+    yield '  then the linter and the default rules', f'{later:10.1f} ms'
+    if lazy > STARTUP_BUDGET_MS:
+        failures.append(f'import yamllint.cli took {lazy:.1f} ms, more than '
+                        f'the budget of {STARTUP_BUDGET_MS} ms')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arg_parser.add_argument('-r', '--repeat', type=int, default=5,
+                            help='number of runs of each measure (default: 5)')
+    arg_parser.add_argument('cases', metavar='CASE', nargs='*',
+                            help=f'cases to run (default: all), among: '
+                                 f'{", ".join(CASES)}')
+    args = arg_parser.parse_args()
+    for name in args.cases:
+        if name not in CASES:
+            arg_parser.error(f'unknown case: {name}')
+
+    for name in args.cases or CASES:
+        for label, result in CASES[name](args.repeat):
+            print(f'{name:14} {label:48} {result}', flush=True)
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
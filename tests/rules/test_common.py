@@ -13,11 +13,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import re
 import unittest
 
 import yaml
 
-from yamllint.rules.common import get_line_indent
+from yamllint.parser import line_starts
+from yamllint.rules.common import (
+    PatternList,
+    classify_scalar,
+    get_line_indent,
+)
 
 
 class CommonTestCase(unittest.TestCase):
@@ -41,3 +47,57 @@ class CommonTestCase(unittest.TestCase):
             self.assertEqual(get_line_indent(tokens[i]), 0)
         for i in (13, 16, 18, 22, 24):
             self.assertEqual(get_line_indent(tokens[i]), 2)
+
+        starts = line_starts(tokens[0].start_mark.buffer)
+        for i in (3, 5, 7, 13, 16, 18, 22, 24):
+            self.assertEqual(get_line_indent(tokens[i], starts),
+                             get_line_indent(tokens[i]))
+
+    def test_classify_scalar(self):
+        tokens = [t for t in yaml.scan('[a, "yes", 012, 0o12, .5, 1e3, .inf,'
+                                       ' .NaN, 42, -1.5e-3]\n')
+                  if isinstance(t, yaml.ScalarToken)]
+        classes = [classify_scalar(t) for t in tokens]
+
+        self.assertEqual(
+            [c.tag.rsplit(':', 1)[1] for c in classes],
+            ['str', 'bool', 'int', 'int', 'float', 'str', 'float', 'float',
+             'int', 'float'])
+        self.assertEqual([c.implicit_octal for c in classes],
+                         [False, False, True] + [False] * 7)
+        self.assertEqual([c.explicit_octal for c in classes],
+                         [False] * 3 + [True] + [False] * 6)
+        self.assertEqual([c.numeral_before_decimal_missing for c in classes],
+                         [False] * 4 + [True] + [False] * 5)
+        self.assertEqual([c.scientific_notation for c in classes],
+                         [False] * 5 + [True] + [False] * 3 + [True])
+        self.assertEqual([c.inf for c in classes],
+                         [False] * 6 + [True] + [False] * 3)
+        self.assertEqual([c.nan for c in classes],
+                         [False] * 7 + [True] + [False] * 2)
+
+        # Classes are reused for the same values
+        self.assertIs(classify_scalar(tokens[3]), classes[3])
+        self.assertIs(classify_scalar(yaml.ScalarToken('0o12', True, None,
+                                                       None)),
+                      classes[3])
+
+    def test_pattern_list(self):
+        patterns = PatternList(['^a', 'b$', 'n(a|o)me', '(?i)^X', r'(.)\1'])
+        self.assertEqual(patterns, ['^a', 'b$', 'n(a|o)me', '(?i)^X',
+                                    r'(.)\1'])
+        self.assertEqual(len(patterns._compiled), 3)
+
+        for string, found in (('abc', True), ('cab', True), ('ba', False),
+                              ('nome', True), ('xyz', True), ('yxz', False),
+                              ('xyzz', True), ('azerty', True), ('', False)):
+            self.assertEqual(patterns.search(string), found, string)
+
+        patterns = PatternList(['^(?P<x>a)', '(?P<x>b)$', 'c'])
+        self.assertEqual(len(patterns._compiled), 3)
+        for string, found in (('ax', True), ('xb', True), ('xcx', True),
+                              ('xa', False), ('bx', False)):
+            self.assertEqual(patterns.search(string), found, string)
+
+        self.assertFalse(PatternList([]).search('a'))
+        self.assertRaises(re.error, PatternList, ['a(b'])
@@ -14,6 +14,10 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from tests.common import RuleTestCase
+import yaml
+
+from yamllint import parser
+from yamllint.rules import key_duplicates
 
 
 class KeyDuplicatesTestCase(RuleTestCase):
@@ -233,3 +237,38 @@ class KeyDuplicatesTestCase(RuleTestCase):
                    'No Merge Keys:\n'
                    '  key: a\n'
                    '  otherkey: b\n', conf)
+
+    def test_many_keys(self):
+        # Keys already seen in a mapping are kept in a set: a new key is only
+        # compared with the ones of the same hash, i.e. with its duplicates
+        comparisons = 0
+
+        class Key(str):
+            __hash__ = str.__hash__
+
+            def __eq__(self, other):
+                nonlocal comparisons
+                comparisons += 1
+                return str.__eq__(self, other)
+
+        n = 2000
+        tokens = list(yaml.scan(
+            '{' + ''.join(f'key{i}: {i}, ' for i in range(n)) +
+            'key0: duplicate, key1999: duplicate}\n'))
+        for token in tokens:
+            if isinstance(token, yaml.ScalarToken):
+                token.value = Key(token.value)
+
+        conf = {'forbid-duplicated-merge-keys': False}
+        context = {'structure': parser.Structure()}
+        problems = []
+        for prev, token, next in zip([None] + tokens[:-1], tokens,
+                                     tokens[1:] + [None], strict=True):
+            context['structure'].update(token)
+            problems.extend(key_duplicates.check(conf, token, prev, next,
+                                                 None, context))
+
+        self.assertEqual([p.desc for p in problems],
+                         ['duplication of key "key0" in mapping',
+                          'duplication of key "key1999" in mapping'])
+        self.assertLessEqual(comparisons, 10)
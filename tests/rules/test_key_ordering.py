@@ -14,8 +14,13 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import locale
+from unittest import mock
 
 from tests.common import RuleTestCase
+import yaml
+
+from yamllint import config, parser
+from yamllint.rules import key_ordering
 
 
 class KeyOrderingTestCase(RuleTestCase):
@@ -112,6 +117,14 @@ class KeyOrderingTestCase(RuleTestCase):
                    '  key: value, mappings, in, flow: sequence\n'
                    ']\n', conf)
 
+    def test_unbalanced_flow_collections(self):
+        conf = 'key-ordering: enable'
+        self.check('---\n'
+                   '{b: 1, a: 2}}\n', conf,
+                   problem1=(2, 8), problem2=(2, 13, 'syntax'))
+        self.check('---\n'
+                   '[b, a]]\n', conf, problem=(2, 7, 'syntax'))
+
     def test_locale_case(self):
         self.addCleanup(locale.setlocale, locale.LC_ALL, (None, None))
         try:
@@ -169,3 +182,68 @@ class KeyOrderingTestCase(RuleTestCase):
                    conf,
                    problem1=(12, 1),
                    problem2=(13, 1))
+
+    def test_invalid_ignored_keys(self):
+        self.assertRaisesRegex(
+            config.YamlLintConfigError,
+            'invalid config: key-ordering: invalid pattern in "ignored-keys"',
+            config.YamlLintConfig,
+            'rules: {key-ordering: {ignored-keys: ["a(b"]}}')
+
+    def test_many_keys(self):
+        # A key is only compared with the greatest key accepted before it in
+        # its mapping, and strxfrm() is called once for keys that repeat in
+        # many mappings
+        comparisons = transforms = 0
+
+        class CollationKey(str):
+            def __lt__(self, other):
+                nonlocal comparisons
+                comparisons += 1
+                return str.__lt__(self, other)
+
+        def strxfrm(value):
+            nonlocal transforms
+            transforms += 1
+            return CollationKey(value)
+
+        n = 1000
+        tokens = list(yaml.scan(
+            ''.join(f'k{i:04}:\n  id: {i}\n  name: k{i}\n' for i in range(n)) +
+            'k0042: unsorted\n'))
+        conf = config.YamlLintConfig('rules: {key-ordering: enable}')
+        context = {'structure': parser.Structure()}
+        problems = []
+        with mock.patch('yamllint.rules.key_ordering.strxfrm', strxfrm):
+            for prev, token, next in zip([None] + tokens[:-1], tokens,
+                                         tokens[1:] + [None], strict=True):
+                context['structure'].update(token)
+                problems.extend(key_ordering.check(
+                    conf.rules['key-ordering'], token, prev, next, None,
+                    context))
+
+        self.assertEqual([(p.line, p.column) for p in problems],
+                         [(3 * n + 1, 1)])
+        self.assertLessEqual(comparisons, 2 * n)
+        self.assertEqual(transforms, n + 2)
+
+    def test_collation_keys_cache(self):
+        context = {}
+        self.assertEqual(key_ordering.collation_key('a', context), ('a',))
+        for i in range(10000):
+            key_ordering.collation_key(f'key{i}', context)
+        self.assertLessEqual(len(context['collation_keys']), 4096)
+
+    def test_null_character(self):
+        conf = 'key-ordering: enable'
+        self.check('---\n'
+                   '"a": 1\n'
+                   '"a\\0": 2\n'
+                   '"a\\0b": 3\n'
+                   '"a\\0b\\0": 4\n'
+                   '"ab": 5\n', conf)
+        self.check('---\n'
+                   '"ab": 1\n'
+                   '"a\\0b": 2\n'
+                   '"a": 3\n', conf,
+                   problem1=(3, 1), problem2=(4, 1))
@@ -176,6 +176,27 @@ class LineLengthTestCase(RuleTestCase):
                    '  {% this line is' + 99 * ' really' + ' long %}\n',
                    conf, problem=(3, 81))
 
+        conf = ('line-length: {max: 20, '
+                'allow-non-breakable-inline-mappings: true}')
+        self.check('---\n'
+                   'long_1: -http://localhost/very/very/long/url\n'
+                   'long_2: "http://localhost/very/very/long/url"\n'
+                   'long_3: [http://localhost/very/very/long/url]\n'
+                   '? long_4\n'
+                   ': http://localhost/very/very/long/url\n'
+                   'long_5: {a: http://localhost/very/very/long/url}\n',
+                   conf, problem=(4, 21))
+        self.check('---\n'
+                   'long_1: http://localhost/very/long/url  # comment\n'
+                   'long_2: "http://localhost/very/long/url"  # comment\n',
+                   conf, problem1=(2, 21), problem2=(3, 21))
+        self.check('---\n'
+                   'long_line: http://localhost/very/long/url: word\n',
+                   conf, problem1=(2, 21), problem2=(2, 42, 'syntax'))
+        self.check('---\n'
+                   'long_line: http://localhost/very/very/long/url\x07\n',
+                   conf, problem1=(2, 21), problem2=(2, 47, 'syntax'))
+
     def test_unicode(self):
         conf = 'line-length: {max: 53}'
         self.check('---\n'
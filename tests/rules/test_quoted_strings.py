@@ -13,9 +13,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import itertools
+
 from tests.common import RuleTestCase
+import yaml
 
 from yamllint import config
+from yamllint.rules import quoted_strings
 
 
 class QuotedValuesTestCase(RuleTestCase):
@@ -477,6 +481,22 @@ class QuotedValuesTestCase(RuleTestCase):
                 '  extra-allowed: [^http://]\n')
         self.assertRaises(config.YamlLintConfigError, self.check, '', conf)
 
+        conf = ('quoted-strings:\n'
+                '  required: only-when-needed\n'
+                '  extra-allowed: ["^(http|ftp"]\n')
+        self.assertRaises(config.YamlLintConfigError, self.check, '', conf)
+
+        # Patterns are valid on their own, even with the same group names
+        conf = ('quoted-strings:\n'
+                '  required: only-when-needed\n'
+                '  extra-allowed: ["^(?P<scheme>http)://", '
+                '"^(?P<scheme>ftp)://"]\n')
+        self.check('---\n'
+                   '- "http://localhost"\n'
+                   '- "ftp://localhost"\n'
+                   '- "localhost"\n',                # fails
+                   conf, problem=(4, 3))
+
         conf = ('quoted-strings:\n'
                 '  required: true\n')
         self.check('---\n'
@@ -561,6 +581,33 @@ class QuotedValuesTestCase(RuleTestCase):
                    'k1: \u001b\n',
                    conf, problem=(2, 5, 'syntax'))
 
+    def test_only_when_needed_plain_scalar_rules(self):
+        def can_be_plain_according_to_loader(value):
+            loader = yaml.BaseLoader('key: ' + value)
+            # Skip StreamStart, BlockMappingStart, Key, Scalar(key) and Value
+            for _ in range(5):
+                loader.get_token()
+            try:
+                a, b = loader.get_token(), loader.get_token()
+            except yaml.scanner.ScannerError:
+                return False
+            return (isinstance(a, yaml.ScalarToken) and a.style is None and
+                    isinstance(b, yaml.BlockEndToken) and a.value == value)
+
+        chars = ('-', '?', ':', ',', '[', ']', '{', '}', '#', '&', '*', '!',
+                 '|', '>', "'", '"', '%', '@', '`', ' ', '\t', '\n', '\r',
+                 '\x85', '\u2028', '\xa0', '\ufeff', 'a', '.', '1', 'é')
+        values = [''.join(v) for n in (1, 2)
+                  for v in itertools.product(chars, repeat=n)]
+        values += ['---', '...', 'a: b', 'a:b', 'a #b', 'a#b', 'a  b',
+                   'a b ', ' a', 'a\tb', '-a - b', '? a', '?a', ':a', '::',
+                   '-:', 'a\n b', 'a\n\n  b',
+                   'http://example.com/path?q=1#anchor', '1.5e3', '~']
+        for value in values:
+            self.assertEqual(quoted_strings._can_be_plain(value),
+                             can_be_plain_according_to_loader(value),
+                             value)
+
     def test_octal_values(self):
         conf = 'quoted-strings: {required: true}\n'
 
@@ -1318,6 +1365,9 @@ class QuotedKeysTestCase(RuleTestCase):
                    conf,
                    problem1=(9, 1), problem2=(10, 1))
 
+        # The resolver of PyYAML must be left untouched
+        self.assertEqual(yaml.safe_load('0o100'), '0o100')
+
     def test_allow_quoted_quotes(self):
         conf = ('quoted-strings:\n'
                 '  check-keys: true\n'
@@ -0,0 +1,158 @@
+# Copyright (C) 2026 Adrien Vergé
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import time
+import unittest
+
+from yamllint import linter
+from yamllint.cache import ProblemCache
+from yamllint.config import YamlLintConfig
+
+
+class ProblemCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory(prefix='yamllint-tests-')
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def test_run(self):
+        conf = YamlLintConfig('extends: default')
+        cache = ProblemCache(self.dir)
+        content = b'key: value  \n'
+
+        problems = cache.run(content, conf, 'file.yaml')
+        self.assertEqual(problems, list(linter.run(content, conf)))
+        self.assertEqual([p.level for p in problems], ['warning', 'error'])
+        self.assertEqual(len(os.listdir(self.dir)), 1)
+
+        cached = cache.run(content, conf, 'other/file.yaml')
+        self.assertEqual(cached, problems)
+        self.assertEqual([(p.desc, p.level) for p in cached],
+                         [(p.desc, p.level) for p in problems])
+        self.assertEqual(len(os.listdir(self.dir)), 1)
+
+    def test_run_replays_cached_problems(self):
+        conf = YamlLintConfig('extends: default')
+        cache = ProblemCache(self.dir)
+        content = b'---\nkey: value\n'
+        key = cache.key(content, conf, 'file.yaml')
+
+        problem = linter.LintProblem(42, 1, 'fake problem', 'fake-rule')
+        problem.level = 'warning'
+        cache.set(key, [problem])
+
+        problems = cache.run(content, conf, 'file.yaml')
+        self.assertEqual(problems, [problem])
+        self.assertEqual(problems[0].level, 'warning')
+
+    def test_key(self):
+        conf = YamlLintConfig('extends: default')
+        cache = ProblemCache(self.dir)
+        key = cache.key(b'key: value\n', conf, 'file.yaml')
+
+        self.assertEqual(cache.key(b'key: value\n', conf, 'file.yaml'), key)
+        self.assertNotEqual(cache.key(b'key: other\n', conf, 'file.yaml'),
+                            key)
+        self.assertNotEqual(
+            cache.key(b'key: value\n',
+                      YamlLintConfig('extends: relaxed'), 'file.yaml'),
+            key)
+        self.assertNotEqual(
+            cache.key(b'key: value\n',
+                      YamlLintConfig('extends: default\n'
+                                     'rules:\n'
+                                     '  line-length: {max: 100}\n'),
+                      'file.yaml'),
+            key)
+
+        conf = YamlLintConfig('extends: default\n'
+                              'rules:\n'
+                              '  line-length:\n'
+                              '    ignore: [ignored.yaml]\n')
+        self.assertNotEqual(cache.key(b'key: value\n', conf, 'ignored.yaml'),
+                            cache.key(b'key: value\n', conf, 'file.yaml'))
+
+    def test_ignored_file(self):
+        conf = YamlLintConfig('extends: default\n'
+                              'ignore: [ignored.yaml]\n')
+        cache = ProblemCache(self.dir)
+
+        self.assertEqual(cache.run(b'key: value  \n', conf, 'ignored.yaml'),
+                         [])
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_corrupted_entry(self):
+        conf = YamlLintConfig('extends: default')
+        cache = ProblemCache(self.dir)
+        content = b'key: value  \n'
+        key = cache.key(content, conf, 'file.yaml')
+
+        with open(os.path.join(self.dir, f'{key}.json'), 'w',
+                  encoding='utf-8') as f:
+            f.write('[[1, 2')
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.run(content, conf, 'file.yaml'),
+                         list(linter.run(content, conf)))
+
+    def test_prune(self):
+        conf = YamlLintConfig('extends: default')
+        cache = ProblemCache(self.dir, max_age=3600, max_size=1000)
+        keys = []
+        for i in range(10):
+            content = f'key: value {i}  \n'.encode()
+            cache.run(content, conf, 'file.yaml')
+            keys.append(cache.key(content, conf, 'file.yaml'))
+        now = time.time()
+        for i, key in enumerate(keys):
+            os.utime(os.path.join(self.dir, f'{key}.json'),
+                     (now - 60 * (10 - i), now - 60 * (10 - i)))
+        os.utime(os.path.join(self.dir, f'{keys[5]}.json'),
+                 (now - 7200, now - 7200))
+        entry_size = os.path.getsize(os.path.join(self.dir,
+                                                  f'{keys[0]}.json'))
+        # Files that are not entries of the cache must be left untouched
+        for name in ('notes.txt', f'{keys[0]}.yaml', f'x{keys[0]}.json'):
+            with open(os.path.join(self.dir, name), 'w',
+                      encoding='utf-8') as f:
+                f.write(1000 * 'x')
+            os.utime(os.path.join(self.dir, name), (0, 0))
+
+        cache.max_size = 6 * entry_size
+        cache.prune()
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         sorted([f'{key}.json'
+                                 for key in keys[3:5] + keys[6:]] +
+                                ['notes.txt', f'{keys[0]}.yaml',
+                                 f'x{keys[0]}.json']))
+
+        cache.prune()
+        self.assertEqual(len(os.listdir(self.dir)), 9)
+
+    def test_prune_temporary_files(self):
+        cache = ProblemCache(self.dir, max_age=3600)
+        cache.set(64 * 'a', [])
+        stale = os.path.join(self.dir, f'.{64 * "b"}.k2j4_x9q.tmp')
+        with open(stale, 'w', encoding='utf-8') as f:
+            f.write('[')
+        os.utime(stale, (0, 0))
+
+        cache.prune()
+        self.assertEqual(os.listdir(self.dir), [f'{64 * "a"}.json'])
+
+    def test_prune_missing_directory(self):
+        ProblemCache(os.path.join(self.dir, 'does-not-exist')).prune()
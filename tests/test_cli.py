@@ -15,6 +15,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import glob
+import io
 import locale
 import os
 import pty
@@ -22,6 +23,7 @@ import shutil
 import sys
 import tempfile
 import unittest
+from unittest import mock
 
 from tests.common import (
     RunContext,
@@ -32,7 +34,7 @@ from tests.common import (
     unregister_test_codecs,
 )
 
-from yamllint import cli, config
+from yamllint import cli, config, linter
 
 
 # Check system's UTF-8 availability
@@ -228,6 +230,48 @@ class CommandLineTestCase(unittest.TestCase):
             [os.path.join(self.wd, 'non-ascii/éçäγλνπ¥/utf-8')]
         )
 
+    def test_find_files_recursively_with_ignore(self):
+        conf = config.YamlLintConfig('extends: default\n'
+                                     'ignore: |\n'
+                                     '  s/\n'
+                                     '  sub/\n'
+                                     '  symlinks\n')
+        self.assertEqual(
+            sorted(cli.find_files_recursively([self.wd], conf)),
+            [os.path.join(self.wd, 'a.yaml'),
+             os.path.join(self.wd, 'c.yaml'),
+             os.path.join(self.wd, 'dos.yml'),
+             os.path.join(self.wd, 'empty.yml'),
+             os.path.join(self.wd, 'en.yaml'),
+             os.path.join(self.wd, 'warn.yaml')],
+        )
+
+        conf = config.YamlLintConfig('extends: default\n'
+                                     'ignore: |\n'
+                                     '  sub/\n'
+                                     '  !**/sub/ok.yaml\n'
+                                     '  s/\n')
+        self.assertEqual(
+            sorted(cli.find_files_recursively([self.wd], conf)),
+            [os.path.join(self.wd, 'a.yaml'),
+             os.path.join(self.wd, 'c.yaml'),
+             os.path.join(self.wd, 'dos.yml'),
+             os.path.join(self.wd, 'empty.yml'),
+             os.path.join(self.wd, 'en.yaml'),
+             os.path.join(self.wd, 'sub/ok.yaml'),
+             os.path.join(self.wd, 'symlinks/link.yaml'),
+             os.path.join(self.wd, 'warn.yaml')],
+        )
+
+    def test_find_files_recursively_order(self):
+        conf = config.YamlLintConfig('extends: default\n'
+                                     'yaml-files: [\'*\']\n')
+        expected = []
+        for root, _dirnames, filenames in os.walk(self.wd):
+            expected.extend(os.path.join(root, f) for f in filenames)
+        self.assertEqual(list(cli.find_files_recursively([self.wd], conf)),
+                         expected)
+
     def test_run_with_bad_arguments(self):
         with RunContext(self) as ctx:
             cli.run(())
@@ -470,6 +514,148 @@ class CommandLineTestCase(unittest.TestCase):
             f'{path}:3:1: [error] duplication of key "key" in mapping '
             f'(key-duplicates)\n'))
 
+    def test_run_multiple_files_in_parallel(self):
+        with RunContext(self) as serial:
+            cli.run(('-f', 'parsable', self.wd))
+        for jobs in ('2', 'auto'):
+            with RunContext(self) as parallel:
+                cli.run(('-f', 'parsable', '-j', jobs, self.wd))
+            self.assertEqual(
+                (parallel.returncode, parallel.stdout, parallel.stderr),
+                (serial.returncode, serial.stdout, serial.stderr))
+
+        items = [os.path.join(self.wd, 'a.yaml'),
+                 os.path.join(self.wd, 'i-do-not-exist.yaml'),
+                 os.path.join(self.wd, 'warn.yaml')]
+        with RunContext(self) as ctx:
+            cli.run(['-f', 'parsable', '-j', '2'] + items)
+        self.assertEqual(ctx.returncode, -1)
+        self.assertEqual(ctx.stdout, (
+            f'{items[0]}:2:4: [error] trailing spaces (trailing-spaces)\n'
+            f'{items[0]}:3:4: [error] no new line character at the end of '
+            f'file (new-line-at-end-of-file)\n'))
+        self.assertRegex(ctx.stderr, r'No such file or directory')
+
+        for jobs in ('0', '-1', 'many'):
+            with RunContext(self) as ctx:
+                cli.run(('-j', jobs, self.wd))
+            self.assertEqual(ctx.returncode, 2)
+            self.assertRegex(ctx.stderr.splitlines()[-1],
+                             r'^yamllint: error: argument -j/--jobs: ')
+
+    def test_run_files_from(self):
+        self.addCleanup(setattr, sys, 'stdin', sys.__stdin__)
+        items = [os.path.join(self.wd, 'a.yaml'),
+                 os.path.join(self.wd, 's'),
+                 os.path.join(self.wd, 'warn.yaml')]
+        with RunContext(self) as expected:
+            cli.run(['-f', 'parsable'] + items)
+        self.assertEqual(expected.returncode, 1)
+
+        temp_dir = tempfile.mkdtemp(prefix='yamllint-tests-')
+        self.addCleanup(shutil.rmtree, temp_dir)
+        files_list = os.path.join(temp_dir, 'files-list')
+        with open(files_list, 'w', encoding='utf-8') as f:
+            f.write(f'{items[0]}\n{items[1]}\n\n{items[2]}\n')
+        for jobs in ('1', '2'):
+            with RunContext(self) as ctx:
+                cli.run(('-f', 'parsable', '-j', jobs,
+                         '--files-from', files_list))
+            self.assertEqual((ctx.returncode, ctx.stdout, ctx.stderr),
+                             (1, expected.stdout, ''))
+
+        sys.stdin = io.TextIOWrapper(io.BytesIO(
+            f'{items[0]}\r\n{items[1]}\r\n\r\n{items[2]}\r\n'.encode()),
+            encoding='utf-8')
+        with RunContext(self) as ctx:
+            cli.run(('-f', 'parsable', '--files-from', '-'))
+        self.assertEqual((ctx.returncode, ctx.stdout, ctx.stderr),
+                         (1, expected.stdout, ''))
+
+        for argv in (('--files-from', '-', '-0'), ('--files-from=-', '-0')):
+            sys.stdin = io.TextIOWrapper(io.BytesIO(
+                '\0'.join(items).encode()), encoding='utf-8')
+            with RunContext(self) as ctx:
+                cli.run(('-f', 'parsable') + argv)
+            self.assertEqual((ctx.returncode, ctx.stdout, ctx.stderr),
+                             (1, expected.stdout, ''))
+
+        sys.stdin = io.TextIOWrapper(io.BytesIO(
+            f'{items[0]}\n{items[1]}'.encode()), encoding='utf-8')
+        with RunContext(self) as ctx:
+            cli.run(('--list-files', '--files-from', '-'))
+        self.assertEqual((ctx.returncode, ctx.stderr), (0, ''))
+        self.assertEqual(ctx.stdout.splitlines(), [
+            items[0],
+            items[1] + '/s/s/s/s/s/s/s/s/s/s/s/s/s/s/file.yaml'])
+
+        with RunContext(self) as ctx:
+            cli.run(('--files-from', os.path.join(temp_dir, 'not-a-list')))
+        self.assertEqual((ctx.returncode, ctx.stdout), (-1, ''))
+        self.assertRegex(ctx.stderr, r'No such file or directory')
+
+        with RunContext(self) as ctx:
+            cli.run(('--files-from', files_list, items[0]))
+        self.assertEqual(ctx.returncode, 2)
+        self.assertRegex(ctx.stderr.splitlines()[-1],
+                         r'not allowed with argument --files-from$')
+
+        with RunContext(self) as ctx:
+            cli.run(('-0', items[0]))
+        self.assertEqual(ctx.returncode, 2)
+        self.assertRegex(ctx.stderr.splitlines()[-1],
+                         r'^yamllint: error: argument -0/--null: ')
+
+    def test_run_with_cache(self):
+        with RunContext(self) as ctx:
+            cli.run(('-f', 'parsable', self.wd))
+        expected = (ctx.returncode, ctx.stdout, ctx.stderr)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for args in (('--cache-dir', cache_dir),
+                         ('--cache', '--cache-dir', cache_dir),
+                         ('--cache-dir', cache_dir, '-j', '2')):
+                with RunContext(self) as ctx:
+                    cli.run(('-f', 'parsable') + args + (self.wd, ))
+                self.assertEqual((ctx.returncode, ctx.stdout, ctx.stderr),
+                                 expected)
+            self.assertNotEqual(os.listdir(cache_dir), [])
+
+        with tempfile.TemporaryDirectory() as cache_home:
+            os.environ['XDG_CACHE_HOME'] = cache_home
+            self.addCleanup(os.environ.__delitem__, 'XDG_CACHE_HOME')
+            with RunContext(self) as ctx:
+                cli.run(('-f', 'parsable', '--cache', self.wd))
+            self.assertEqual((ctx.returncode, ctx.stdout, ctx.stderr),
+                             expected)
+            self.assertNotEqual(
+                os.listdir(os.path.join(cache_home, 'yamllint')), [])
+            self.assertFalse(os.path.exists(os.path.join(self.wd,
+                                                         'yamllint')))
+
+    def test_run_per_document(self):
+        with RunContext(self) as ctx:
+            cli.run(('-f', 'parsable', self.wd))
+        expected = (ctx.returncode, ctx.stdout, ctx.stderr)
+
+        for args in (('--per-document', ), ('--per-document', '-j', '2')):
+            with RunContext(self) as ctx:
+                cli.run(('-f', 'parsable') + args + (self.wd, ))
+            self.assertEqual((ctx.returncode, ctx.stdout, ctx.stderr),
+                             expected)
+
+        path = os.path.join(self.wd, 'i-do-not-exist.yaml')
+        with RunContext(self) as ctx:
+            cli.run(('--per-document', path))
+        self.assertEqual((ctx.returncode, ctx.stdout), (-1, ''))
+        self.assertRegex(ctx.stderr, r'No such file or directory')
+
+        for args in (('--cache', ), ('--cache-dir', self.wd)):
+            with RunContext(self) as ctx:
+                cli.run(('--per-document', ) + args + (self.wd, ))
+            self.assertEqual(ctx.returncode, 2)
+            self.assertRegex(ctx.stderr, r'not allowed with argument')
+
     def test_run_piped_output_nocolor(self):
         path = os.path.join(self.wd, 'a.yaml')
 
@@ -592,6 +778,29 @@ class CommandLineTestCase(unittest.TestCase):
         self.assertEqual(
             (ctx.returncode, ctx.stdout, ctx.stderr), (1, expected_out, ''))
 
+    def test_show_problems_by_batches(self):
+        problems = []
+        for i in range(2 * cli.OUTPUT_BATCH_SIZE + 1):
+            problems.append(linter.LintProblem(i + 1, 1, 'problem', 'rule'))
+            problems[-1].level = 'error'
+
+        for args_format, header, footer in (
+                ('parsable', [], []),
+                ('github', ['::group::file.yaml'], ['::endgroup::', '']),
+                ('standard', ['file.yaml'], [''])):
+            writes = []
+            with mock.patch('sys.stdout.write', writes.append):
+                level = cli.show_problems(problems, 'file.yaml', args_format,
+                                          False)
+            self.assertEqual(level, 2)
+            # Lines are written at once, unless there are too many
+            self.assertEqual(len(writes), 3)
+            self.assertEqual(''.join(writes).split('\n'), [
+                *header,
+                *(getattr(cli.Format, args_format)(problem, 'file.yaml')
+                  for problem in problems),
+                *footer, ''])
+
     def test_github_actions_detection(self):
         path = os.path.join(self.wd, 'a.yaml')
         self.addCleanup(os.environ.__delitem__, 'GITHUB_ACTIONS')
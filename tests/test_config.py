@@ -17,11 +17,14 @@
 from io import StringIO
 import itertools
 import os
+import pickle
 import shutil
 import sys
 import tempfile
 import unittest
+from unittest import mock
 
+from pathspec import GitIgnoreSpec
 from tests.common import (
     RunContext,
     build_temp_workspace,
@@ -407,6 +410,107 @@ class ExtendedConfigTestCase(unittest.TestCase):
         self.assertEqual(c.ignore.match_file('test.template.yaml'), True)
         self.assertEqual(c.ignore.match_file('test.yaml'), False)
 
+    def test_extended_config_cache(self):
+        wd = build_temp_workspace({
+            'base.yaml': 'extends: default\n'
+                         'rules:\n'
+                         '  colons:\n'
+                         '    max-spaces-after: 2\n',
+        })
+        self.addCleanup(shutil.rmtree, wd)
+        base = os.path.join(wd, 'base.yaml')
+
+        c1 = config.YamlLintConfig('extends: ' + base + '\n'
+                                   'rules:\n'
+                                   '  colons:\n'
+                                   '    max-spaces-before: 3\n'
+                                   '  hyphens: disable\n')
+        shared = config.load_extended_config(base)
+        c2 = config.YamlLintConfig('extends: ' + base + '\n')
+        self.assertIs(config.load_extended_config(base), shared)
+
+        # Extending configurations did not modify the shared one
+        self.assertEqual(c1.rules['colons']['max-spaces-before'], 3)
+        self.assertEqual(c1.rules['colons']['max-spaces-after'], 2)
+        self.assertFalse(c1.rules['hyphens'])
+        self.assertEqual(shared.rules['colons']['max-spaces-before'], 0)
+        self.assertEqual(shared.rules['hyphens']['max-spaces-after'], 1)
+        self.assertEqual(c2.rules['colons']['max-spaces-before'], 0)
+        self.assertEqual(c2.rules['colons']['max-spaces-after'], 2)
+        self.assertEqual(c2.rules['hyphens']['max-spaces-after'], 1)
+
+        # Modifying the file invalidates the cache
+        with open(base, 'w', encoding='utf_8') as f:
+            f.write('extends: relaxed\n'
+                    'rules:\n'
+                    '  colons:\n'
+                    '    max-spaces-after: 4\n')
+        os.utime(base, ns=(0, 0))
+        c3 = config.YamlLintConfig('extends: ' + base + '\n')
+        self.assertIsNot(config.load_extended_config(base), shared)
+        self.assertEqual(c3.rules['colons']['max-spaces-after'], 4)
+        self.assertEqual(c3.rules['hyphens']['level'], 'warning')
+
+    def test_extended_config_cache_recursive(self):
+        wd = build_temp_workspace({
+            'base.yaml': 'rules:\n'
+                         '  colons:\n'
+                         '    max-spaces-after: 2\n',
+            'middle.yaml': 'extends: base.yaml\n',
+        })
+        self.addCleanup(shutil.rmtree, wd)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(wd)
+
+        c = config.YamlLintConfig('extends: middle.yaml\n')
+        self.assertEqual(c.rules['colons']['max-spaces-after'], 2)
+        self.assertEqual(len(config.load_extended_config('middle.yaml')
+                             .sources), 2)
+
+        with open('base.yaml', 'w', encoding='utf_8') as f:
+            f.write('rules:\n'
+                    '  colons:\n'
+                    '    max-spaces-after: 10\n')
+        os.utime('base.yaml', ns=(0, 0))
+        c = config.YamlLintConfig('extends: middle.yaml\n')
+        self.assertEqual(c.rules['colons']['max-spaces-after'], 10)
+
+    def test_extended_config_cache_relative_extends(self):
+        wd = build_temp_workspace({
+            'shared/base.yaml': 'extends: other.yaml\n',
+            'r1/other.yaml': 'rules:\n'
+                             '  truthy: enable\n',
+            'r2/other.yaml': 'rules:\n'
+                             '  key-duplicates: enable\n',
+        })
+        self.addCleanup(shutil.rmtree, wd)
+        self.addCleanup(os.chdir, os.getcwd())
+        base = os.path.join(wd, 'shared', 'base.yaml')
+
+        # The relative name is resolved again from each working directory
+        for repo, rules in (('r1', ['truthy']), ('r2', ['key-duplicates']),
+                            ('r1', ['truthy'])):
+            os.chdir(os.path.join(wd, repo))
+            c = config.YamlLintConfig('extends: ' + base + '\n')
+            self.assertEqual([rule.ID for rule in c.enabled_rules(None)],
+                             rules)
+
+    def test_extended_config_cache_ignore_from_file(self):
+        wd = build_temp_workspace({
+            'base.yaml': 'ignore-from-file: .gitignore\n',
+            '.gitignore': '*.template.yaml\n',
+        })
+        self.addCleanup(shutil.rmtree, wd)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(wd)
+
+        # Configurations depending on other files are not cached
+        c = config.YamlLintConfig('extends: base.yaml\n')
+        self.assertTrue(c.is_file_ignored('a.template.yaml'))
+        self.assertIsNone(c.sources)
+        self.assertIsNot(config.load_extended_config('base.yaml'),
+                         config.load_extended_config('base.yaml'))
+
 
 class ExtendedLibraryConfigTestCase(unittest.TestCase):
     def test_extend_config_disable_rule(self):
@@ -494,6 +598,80 @@ class IgnoreConfigTestCase(unittest.TestCase):
 
         shutil.rmtree(cls.wd)
 
+    def test_is_directory_ignored(self):
+        conf = config.YamlLintConfig('extends: default\n')
+        self.assertFalse(conf.is_directory_ignored('node_modules'))
+
+        conf = config.YamlLintConfig('extends: default\n'
+                                     'ignore: |\n'
+                                     '  node_modules/\n'
+                                     '  /build\n'
+                                     '  *.yaml\n')
+        self.assertTrue(conf.is_directory_ignored('node_modules'))
+        self.assertTrue(conf.is_directory_ignored('./node_modules'))
+        self.assertTrue(conf.is_directory_ignored('sub/node_modules/'))
+        self.assertTrue(conf.is_directory_ignored('build'))
+        self.assertFalse(conf.is_directory_ignored('sub/build'))
+        self.assertTrue(conf.is_directory_ignored('dir.yaml'))
+        self.assertFalse(conf.is_directory_ignored('sub'))
+
+        # Files under the directory could be re-included
+        conf = config.YamlLintConfig('extends: default\n'
+                                     'ignore: |\n'
+                                     '  node_modules/\n'
+                                     '  !node_modules/keep.yaml\n')
+        self.assertFalse(conf.is_directory_ignored('node_modules'))
+
+    def test_enabled_rules_with_ignores(self):
+        conf = config.YamlLintConfig('rules:\n'
+                                     '  colons:\n'
+                                     '    ignore: "*.yml"\n'
+                                     '  commas:\n'
+                                     '    ignore: ["*.yml"]\n'
+                                     '  hyphens: enable\n'
+                                     '  braces:\n'
+                                     '    ignore: "gen/"\n'
+                                     '  truthy: disable\n')
+
+        def ids(filepath):
+            return [rule.ID for rule in conf.enabled_rules(filepath)]
+
+        with mock.patch.object(GitIgnoreSpec, 'match_file', autospec=True,
+                               side_effect=GitIgnoreSpec.match_file
+                               ) as match_file:
+            self.assertEqual(ids('a.yaml'),
+                             ['colons', 'commas', 'hyphens', 'braces'])
+            self.assertEqual(match_file.call_count, 2)
+            self.assertEqual(ids('a.yaml'),
+                             ['colons', 'commas', 'hyphens', 'braces'])
+            self.assertEqual(match_file.call_count, 2)
+            self.assertEqual(ids('a.yml'), ['hyphens', 'braces'])
+            self.assertEqual(ids('gen/a.yml'), ['hyphens'])
+            self.assertEqual(ids('gen/a.yaml'),
+                             ['colons', 'commas', 'hyphens'])
+            self.assertEqual(match_file.call_count, 8)
+        self.assertEqual(ids(None), ['colons', 'commas', 'hyphens', 'braces'])
+
+        # Callers get their own list
+        conf.enabled_rules('b.yml').clear()
+        self.assertEqual(ids('b.yml'), ['hyphens', 'braces'])
+
+        # Changed rules are taken into account once validated
+        conf.rules['truthy'] = {}
+        conf.validate()
+        self.assertEqual(ids('b.yml'), ['hyphens', 'braces', 'truthy'])
+
+    def test_pickle(self):
+        conf = config.YamlLintConfig('extends: default\n'
+                                     'rules:\n'
+                                     '  colons:\n'
+                                     '    ignore: "*.yml"\n')
+        rules = conf.enabled_rules('a.yml')
+        copy = pickle.loads(pickle.dumps(conf))
+        self.assertEqual(copy.rules, conf.rules)
+        self.assertEqual(copy.enabled_rules('a.yml'), rules)
+        self.assertEqual(len(copy.enabled_rules('a.yaml')), len(rules) + 1)
+
     def test_mutually_exclusive_ignore_keys(self):
         self.assertRaises(
             YamlLintConfigError,
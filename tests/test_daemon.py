@@ -0,0 +1,258 @@
+# Copyright (C) 2026 Adrien Vergé
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import os
+import shutil
+import socket
+import sys
+import threading
+import unittest
+from unittest import mock
+
+from tests.common import RunContext, build_temp_workspace
+
+from yamllint import cli, daemon
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'requires Unix sockets')
+class DaemonTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.wd = build_temp_workspace({
+            'a.yaml': '---\n'
+                      '- 1   \n'
+                      '- 2',
+            'warn.yaml': 'key: value\n',
+            'sub/ok.yaml': '---\n'
+                           'key: value\n',
+            '.yamllint': 'extends: default\n'
+                         'rules:\n'
+                         '  document-start: disable\n',
+        })
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+
+        shutil.rmtree(cls.wd)
+
+    def setUp(self):
+        super().setUp()
+        self.socket = os.path.join(self.wd, 'yamllint.sock')
+        env = mock.patch.dict(os.environ,
+                              {'YAMLLINT_DAEMON_SOCKET': self.socket})
+        env.start()
+        self.addCleanup(env.stop)
+        cwd = os.getcwd()
+        os.chdir(self.wd)
+        self.addCleanup(os.chdir, cwd)
+
+    def start_server(self):
+        server = daemon.Server(self.socket)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            thread.join()
+            server.server_close()
+            os.unlink(self.socket)
+        self.addCleanup(stop)
+
+    def run_both(self, argv):
+        with RunContext(self) as one_shot:
+            cli.run(argv)
+        with RunContext(self) as client:
+            daemon.client(argv)
+        return one_shot, client
+
+    def test_client(self):
+        self.start_server()
+
+        for argv in (('-f', 'parsable', '.'),
+                     ('-f', 'standard', 'a.yaml', 'warn.yaml'),
+                     ('-s', 'warn.yaml'),
+                     ('-d', 'relaxed', '--no-warnings', '.'),
+                     ('does-not-exist.yaml', ),
+                     ('--unknown-arg', ),
+                     ('--version', )):
+            one_shot, client = self.run_both(argv)
+            self.assertEqual(
+                (client.returncode, client.stdout, client.stderr),
+                (one_shot.returncode, one_shot.stdout, one_shot.stderr))
+        self.assertEqual(client.returncode, 0)
+
+    def test_client_environment(self):
+        self.start_server()
+
+        with mock.patch.dict(os.environ, {'GITHUB_ACTIONS': 'true',
+                                          'GITHUB_WORKFLOW': 'tests'}):
+            one_shot, client = self.run_both(('a.yaml', ))
+        self.assertEqual(client.stdout, one_shot.stdout)
+        self.assertIn('::group::a.yaml', client.stdout)
+
+        os.chdir('sub')
+        one_shot, client = self.run_both(('-f', 'parsable', '../warn.yaml'))
+        self.assertEqual(client.stdout, one_shot.stdout)
+        self.assertEqual(client.stdout, '')
+
+    def test_client_stdin(self):
+        self.start_server()
+        self.addCleanup(setattr, sys, 'stdin', sys.__stdin__)
+
+        sys.stdin = io.TextIOWrapper(io.BytesIO(b'key: value\n'
+                                                b'key: other\n'),
+                                     encoding='utf-8')
+        with RunContext(self) as ctx:
+            daemon.client(('-', '-f', 'parsable'))
+        self.assertEqual(
+            (ctx.returncode, ctx.stdout, ctx.stderr),
+            (1, ('stdin:2:1: [error] duplication of key "key" in mapping '
+                 '(key-duplicates)\n'), ''))
+
+        for argv in (('--files-from', '-'), ('--files-from=-', )):
+            sys.stdin = io.TextIOWrapper(io.BytesIO(b'a.yaml\nwarn.yaml\n'),
+                                         encoding='utf-8')
+            with RunContext(self) as ctx:
+                daemon.client(('-f', 'parsable') + argv)
+            self.assertEqual(
+                (ctx.returncode, ctx.stdout, ctx.stderr),
+                (1, ('a.yaml:2:4: [error] trailing spaces (trailing-spaces)\n'
+                     'a.yaml:3:4: [error] no new line character at the end '
+                     'of file (new-line-at-end-of-file)\n'), ''))
+
+    def test_client_environment_variables(self):
+        self.start_server()
+
+        requests = []
+        original_run_request = daemon.run_request
+
+        def run_request(request, stdin):
+            requests.append(request)
+            return original_run_request(request, stdin)
+
+        with mock.patch.dict(os.environ, {'SECRET_TOKEN': 'secret',
+                                          'XDG_CONFIG_HOME': self.wd}):
+            with mock.patch('yamllint.daemon.run_request', run_request):
+                with RunContext(self) as ctx:
+                    daemon.client(('a.yaml', ))
+        self.assertEqual(ctx.returncode, 1)
+        self.assertEqual(len(requests), 1)
+        self.assertNotIn('SECRET_TOKEN', requests[0]['env'])
+        self.assertEqual(requests[0]['env']['XDG_CONFIG_HOME'], self.wd)
+
+    def test_client_checks_socket(self):
+        self.start_server()
+        daemon.send_request(self.socket, ['--version'])
+
+        # Other users could talk to the daemon (or have replaced it)
+        os.chmod(self.socket, 0o666)
+        self.addCleanup(os.chmod, self.socket, 0o600)
+        self.assertRaises(PermissionError,
+                          daemon.send_request, self.socket, ['--version'])
+        os.chmod(self.socket, 0o600)
+
+        # Other users could replace the socket
+        os.chmod(self.wd, 0o777)
+        self.addCleanup(os.chmod, self.wd, 0o700)
+        self.assertRaises(PermissionError,
+                          daemon.send_request, self.socket, ['--version'])
+
+        # The client then lints files by itself
+        one_shot, client = self.run_both(('-f', 'parsable', '.'))
+        self.assertEqual(
+            (client.returncode, client.stdout, client.stderr),
+            (one_shot.returncode, one_shot.stdout, one_shot.stderr))
+
+    def test_default_socket_path(self):
+        with mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.wd}):
+            self.assertEqual(daemon.default_socket_path(),
+                             os.path.join(self.wd, 'yamllint.sock'))
+        with mock.patch.dict(os.environ):
+            os.environ.pop('XDG_RUNTIME_DIR', None)
+            path = daemon.default_socket_path()
+        # In a directory private to the user, not directly in /tmp
+        self.assertEqual(os.path.basename(os.path.dirname(path)),
+                         f'yamllint-{os.getuid()}')
+
+    def test_daemon_default_socket(self):
+        # The daemon listens where the client connects by default
+        with mock.patch('yamllint.daemon.serve') as serve:
+            with RunContext(self) as ctx:
+                cli.run(('--daemon', ))
+        self.assertEqual(ctx.returncode, 0)
+        serve.assert_called_once_with(self.socket)
+
+    def test_serve_in_shared_directory(self):
+        shared = os.path.join(self.wd, 'shared')
+        os.mkdir(shared)
+        os.chmod(shared, 0o777)
+        with RunContext(self) as ctx:
+            cli.run(('--daemon', os.path.join(shared, 'yamllint.sock')))
+        self.assertEqual(ctx.returncode, -1)
+        self.assertRegex(ctx.stderr, r'is not private to the current user')
+        self.assertEqual(os.listdir(shared), [])
+
+    def test_client_without_daemon(self):
+        one_shot, client = self.run_both(('-f', 'parsable', '.'))
+        self.assertEqual(
+            (client.returncode, client.stdout, client.stderr),
+            (one_shot.returncode, one_shot.stdout, one_shot.stderr))
+        self.assertEqual(client.returncode, 1)
+
+    def test_daemon_through_client(self):
+        self.start_server()
+
+        with RunContext(self) as ctx:
+            daemon.client(('--daemon', os.path.join(self.wd, 'other.sock')))
+        self.assertEqual(ctx.returncode, 2)
+        self.assertEqual(ctx.stdout, '')
+        self.assertRegex(ctx.stderr.splitlines()[-1],
+                         r'^yamllint: error: argument --daemon: not allowed')
+
+    def test_daemon_through_client_without_daemon(self):
+        other_socket = os.path.join(self.wd, 'other.sock')
+        with RunContext(self) as ctx:
+            daemon.client(('--daemon', other_socket))
+        self.assertEqual(ctx.returncode, 2)
+        self.assertEqual(ctx.stdout, '')
+        self.assertRegex(ctx.stderr.splitlines()[-1],
+                         r'^yamllint: error: argument --daemon: not allowed')
+        self.assertFalse(os.path.exists(other_socket))
+        self.assertFalse(daemon.running_for_client)
+
+    def test_daemon_already_running(self):
+        self.start_server()
+
+        with RunContext(self) as ctx:
+            cli.run(('--daemon', self.socket))
+        self.assertEqual(
+            (ctx.returncode, ctx.stdout, ctx.stderr),
+            (-1, '', (f'a yamllint daemon is already listening on '
+                      f'{self.socket}\n')))
+
+    def test_stale_socket(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.bind(self.socket)
+        self.assertTrue(os.path.exists(self.socket))
+
+        daemon._remove_stale_socket(self.socket)
+        self.assertFalse(os.path.exists(self.socket))
+
+        self.start_server()
+        self.assertRaises(OSError, daemon._remove_stale_socket, self.socket)
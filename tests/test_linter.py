@@ -14,9 +14,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import io
+import os
+import pickle
 import unittest
+from unittest import mock
 
-from yamllint import linter
+from yamllint import linter, parser
 from yamllint.config import YamlLintConfig
 
 
@@ -64,3 +67,248 @@ class LinterTestCase(unittest.TestCase):
         problem = linter.LintProblem(1, 2, 'problem', 'rule-id')
 
         self.assertEqual(str(problem), '1:2: problem (rule-id)')
+
+    def test_linter_problem_is_slotted(self):
+        problem = linter.LintProblem(1, 2, 'problem', 'rule-id')
+        problem.level = 'warning'
+
+        self.assertFalse(hasattr(problem, '__dict__'))
+        self.assertRaises(AttributeError, setattr, problem, 'other', 0)
+        self.assertEqual(pickle.loads(pickle.dumps(problem)), problem)
+        self.assertEqual(pickle.loads(pickle.dumps(problem)).level, 'warning')
+
+    def test_token_types(self):
+        # Rules that declare TOKEN_TYPES must find the same problems when only
+        # given these tokens as when given all tokens.
+        conf = YamlLintConfig('extends: default\n'
+                              'rules:\n'
+                              '  document-end: enable\n'
+                              '  empty-values: enable\n'
+                              '  float-values: enable\n'
+                              '  key-ordering: enable\n'
+                              '  octal-values: enable\n'
+                              '  quoted-strings:\n'
+                              '    required: only-when-needed\n'
+                              '  truthy: {check-keys: true}\n')
+        rules = [rule for rule in conf.enabled_rules(None)
+                 if rule.TYPE == 'token' and hasattr(rule, 'TOKEN_TYPES')]
+        self.assertGreater(len(rules), 0)
+
+        spec_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                'yaml-1.2-spec-examples')
+        for file in sorted(os.listdir(spec_dir)):
+            with open(os.path.join(spec_dir, file), encoding='utf-8') as f:
+                source = f.read()
+            tokens = [elem for elem in
+                      parser.token_or_comment_generator(source)
+                      if isinstance(elem, parser.Token)]
+            for rule in rules:
+                rule_conf = conf.rules[rule.ID]
+
+                def check(only_token_types, rule=rule, rule_conf=rule_conf,
+                          tokens=tokens):
+                    # Like the linter, update the structure for all tokens
+                    context = {'structure': parser.Structure(),
+                               'line_starts': parser.line_starts(source)}
+                    problems = []
+                    for t in tokens:
+                        context['structure'].update(t.curr)
+                        if (only_token_types and
+                                not isinstance(t.curr, rule.TOKEN_TYPES)):
+                            continue
+                        problems.extend(
+                            (p.line, p.column, p.desc)
+                            for p in rule.check(rule_conf, t.curr, t.prev,
+                                                t.next, t.nextnext, context))
+                    return problems
+
+                self.assertEqual(check(True), check(False),
+                                 f'{rule.ID} on {file}')
+
+    def test_check_buffer(self):
+        # Line rules that can check a whole buffer at once must find the same
+        # problems as when checking it line by line.
+        confs = (YamlLintConfig('extends: default\n'
+                                'rules:\n'
+                                '  line-length: {max: 20}\n'),
+                 YamlLintConfig('rules:\n'
+                                '  empty-lines: {max: 0, max-end: 1}\n'
+                                '  line-length:\n'
+                                '    max: 10\n'
+                                '    allow-non-breakable-inline-mappings: '
+                                'true\n'
+                                '  new-lines: {type: dos}\n'))
+        self.assertEqual(
+            {rule.ID for conf in confs for rule in conf.enabled_rules(None)
+             if rule.TYPE == 'line' and hasattr(rule, 'check_buffer')},
+            {'empty-lines', 'line-length', 'new-line-at-end-of-file',
+             'new-lines', 'trailing-spaces'})
+
+        sources = ['', '\n', '\n\n', ' ', 'a', 'a: b  \t', '\r\n\r\n',
+                   'key: value \r\n\r\n\r\n  \n\n\n# comment\n',
+                   'a \x0b\r\r\n \x0c\n\t\r\n-  \n\n',
+                   ('- a list item that is very long\n'
+                    'a_key: with_a_very_long_value_and_no_space  \n'
+                    '# a_very_long_comment_with_no_space\n')]
+        spec_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                'yaml-1.2-spec-examples')
+        for file in sorted(os.listdir(spec_dir)):
+            with open(os.path.join(spec_dir, file), encoding='utf-8') as f:
+                sources.append(f.read())
+
+        for source in sources:
+            for conf in confs:
+                for rule in conf.enabled_rules(None):
+                    if not hasattr(rule, 'check_buffer'):
+                        continue
+                    rule_conf = conf.rules[rule.ID]
+                    self.assertEqual(
+                        [(p.line, p.column, p.desc)
+                         for p in rule.check_buffer(
+                             rule_conf, source, parser.line_starts(source))],
+                        [(p.line, p.column, p.desc)
+                         for line in parser.line_generator(source)
+                         for p in rule.check(rule_conf, line)],
+                        f'{rule.ID} on {source!r}')
+
+    def test_run_with_line_rules_only(self):
+        conf = YamlLintConfig('rules:\n'
+                              '  trailing-spaces: enable\n'
+                              '  line-length: {max: 10}\n')
+        source = ('a: 1  \n'
+                  'b: "  \n'
+                  'c: 1234567890\n')
+        with mock.patch('yamllint.parser.token_or_comment_generator') as gen:
+            problems = list(linter.run(source, conf))
+        gen.assert_not_called()
+        self.assertEqual(
+            [(p.line, p.column, p.rule) for p in problems],
+            [(1, 5, 'trailing-spaces'), (2, 5, 'trailing-spaces'),
+             (3, 11, 'line-length'), (4, 1, None)])
+
+        # Directives are still applied
+        source = ('a: 1  # yamllint disable-line\n'
+                  'b: 1  \n')
+        self.assertEqual(
+            [(p.line, p.column, p.rule) for p in linter.run(source, conf)],
+            [(2, 5, 'trailing-spaces')])
+
+    def test_run_with_token_rules_only(self):
+        conf = YamlLintConfig('rules:\n'
+                              '  colons: enable\n'
+                              '  truthy: enable\n')
+        source = ('a : yes  # yamllint disable-line rule:truthy\n'
+                  '# yamllint disable-line\n'
+                  'b : yes\n'
+                  '# yamllint disable-line\n'
+                  '\n'
+                  'c : yes\n'
+                  '\n'
+                  'd: [\n')
+        with mock.patch('yamllint.parser.token_or_comment_or_line_generator'
+                        ) as gen:
+            problems = list(linter.run(source, conf))
+        gen.assert_not_called()
+        self.assertEqual(
+            [(p.line, p.column, p.rule) for p in problems],
+            [(1, 2, 'colons'), (6, 2, 'colons'), (6, 5, 'truthy'),
+             (9, 1, None)])
+
+    def test_run_per_document(self):
+        # Linting documents one at a time must find the same problems as
+        # linting the whole stream, at the same lines.
+        confs = (
+            self.fake_config(),
+            YamlLintConfig('extends: default\n'
+                           'rules:\n'
+                           '  document-end: enable\n'
+                           '  empty-values: enable\n'
+                           '  indentation:\n'
+                           '    indent-sequences: consistent\n'
+                           '    check-multi-line-strings: true\n'
+                           '  key-ordering: enable\n'
+                           '  quoted-strings: {quote-type: consistent}\n'
+                           '  truthy: {allowed-values: ["yes", "no"]}\n'),
+            YamlLintConfig('extends: relaxed\n'
+                           'rules:\n'
+                           '  document-end: {present: false}\n'
+                           '  document-start: {present: false}\n'),
+            YamlLintConfig('extends: default\n'
+                           'rules:\n'
+                           '  indentation: {spaces: consistent}\n'),
+        )
+        sources = [
+            'key: value\n',
+            '---\nkey: yes\n---\nkey: no  \n...\n',
+            '# comment\n\n---\n- a\n\n\n\n---\n- b\n',
+            ('---\na: 1\n...\n%YAML 1.2\n---\na: on\n...\n'
+             '%YAML 1.1\n# comment\n---\na: on\n'),
+            '---\nkey: value\n%YAML 1.2\n---\ntruthy: on\n',
+            '--- a\n%YAML 1.2\n# comment\n%TAG ! tag:x,2000:\n---\n"b"\n',
+            '---\nk:\n- a\n---\nk:\n  - b\n---\n\'c\'\n---\n"d"\n',
+            ('---\na: 1\n# yamllint disable rule:truthy\n---\nb: yes\n'
+             '# yamllint enable\n---\nc: yes\n'),
+            ('---\na: 1\n# yamllint disable-line rule:document-start\n'
+             '---\nb: yes\n'),
+            '---\r\nkey: value  \r\n---\r\nkey: [a,b]\r\n',
+            '---\nkey: value\n---',
+            '--- |\n  text\n--- >\n  text\n...\n--- !!str\nabc\n',
+            '---\n&anchor a: 1\n---\nb: *anchor\n---\nc: 1   \n\n\n',
+            'd:\n    e: 1\n...\n--- text\n---\nb:\n  - x\n',
+            ('--- a\n...\n#c\n# yamllint disable\n%YAML 1.2\n---\nb: 1\n'
+             '#c\n'),
+            '---\na: 1\n...\n# comment\n...\n---\nb:   1\n...\n\n\n',
+        ]
+        spec_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                'yaml-1.2-spec-examples')
+        for file in sorted(os.listdir(spec_dir)):
+            with open(os.path.join(spec_dir, file), encoding='utf-8') as f:
+                sources.append(f.read())
+
+        for conf in confs:
+            for source in sources:
+                problems = list(linter.run(source, conf))
+                if any(p.rule is None for p in problems):
+                    continue
+                self.assertEqual(
+                    [(p.line, p.column, p.desc, p.rule) for p in
+                     linter.run(source, conf, per_document=True)],
+                    [(p.line, p.column, p.desc, p.rule) for p in problems],
+                    source)
+
+    def test_run_per_document_on_stream(self):
+        source = ('---\n'
+                  'key: "é€"  \n'
+                  '...\n'
+                  '---\n'
+                  'key: value\n'
+                  'key: other\n')
+        expected = [(2, 10, 'trailing-spaces'), (6, 1, 'key-duplicates')]
+        for input in (io.StringIO(source),
+                      io.BytesIO(source.encode('utf-8')),
+                      io.BytesIO(source.encode('utf-16')),
+                      source.encode('utf-32')):
+            self.assertEqual(
+                [(p.line, p.column, p.rule) for p in
+                 linter.run(input, self.fake_config(), per_document=True)],
+                expected)
+
+        self.assertEqual(list(linter._read_lines(
+            io.BytesIO(source.encode('utf-16')), size=3)),
+            source.splitlines(keepends=True))
+
+    def test_run_per_document_with_syntax_error(self):
+        source = ('---\n'
+                  'a: 1\n'
+                  '---\n'
+                  'b: [\n'
+                  '---\n'
+                  'c: 1\n'
+                  '---\n'
+                  'd: ]\n'
+                  '---\n'
+                  'e: 1  \n')
+        self.assertEqual(
+            [(p.line, p.column, p.rule) for p in
+             linter.run(source, self.fake_config(), per_document=True)],
+            [(5, 1, None), (10, 5, 'trailing-spaces')])
@@ -83,3 +83,25 @@ class ModuleTestCase(unittest.TestCase):
             '  (brackets)\n'
             '  2:27      error    trailing spaces  (trailing-spaces)',
             files[1])
+
+    def test_imports_at_startup(self):
+        # Modules that are slow to import must only be imported when needed
+        def imported_modules(code):
+            out = subprocess.check_output(
+                [PYTHON, '-c', f'{code}\nimport sys\nprint(*sys.modules)'])
+            return set(out.decode().split())
+
+        modules = imported_modules('import yamllint.cli')
+        self.assertIn('yamllint.cli', modules)
+        for module in ('yaml', 'pathspec', 'concurrent.futures',
+                       'yamllint.config', 'yamllint.linter',
+                       'yamllint.rules'):
+            self.assertNotIn(module, modules)
+
+        modules = imported_modules(
+            'from yamllint.config import YamlLintConfig\n'
+            'YamlLintConfig("extends: default")')
+        self.assertIn('yamllint.rules.indentation', modules)
+        for rule in ('document_end', 'empty_values', 'float_values',
+                     'key_ordering', 'octal_values', 'quoted_strings'):
+            self.assertNotIn(f'yamllint.rules.{rule}', modules)
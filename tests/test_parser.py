@@ -18,10 +18,17 @@ import unittest
 import yaml
 
 from yamllint.parser import (
+    CBaseLoader,
     Comment,
     Line,
+    SinglePassLoader,
     Token,
+    hash_signs,
+    is_valid_for_libyaml,
     line_generator,
+    line_index,
+    line_index_of_mark,
+    line_starts,
     token_or_comment_generator,
     token_or_comment_or_line_generator,
 )
@@ -66,6 +73,36 @@ class ParserTestCase(unittest.TestCase):
         self.assertEqual(e[2].line_no, 3)
         self.assertEqual(e[2].content, 'at the end')
 
+    def test_line_starts(self):
+        self.assertEqual(list(line_starts('')), [0])
+        self.assertEqual(list(line_starts('\n')), [0, 1])
+        self.assertEqual(list(line_starts('a: b\r\n\n# c')), [0, 6, 7])
+        self.assertEqual(list(hash_signs('# a: b#\n"#"')), [0, 6, 9])
+
+        buffer = '---\nkey: value\n\nend\n'
+        starts = line_starts(buffer)
+        self.assertEqual(list(starts), [0, 4, 15, 16, 20])
+        self.assertEqual([line_index(starts, pointer)
+                          for pointer in (0, 3, 4, 14, 15, 16, 19, 20)],
+                         [0, 0, 1, 1, 2, 3, 3, 4])
+
+        # Lines, tokens and comments hold the line starts they were built from
+        buffer = '---\nk: v  # k=v\n'
+        starts = line_starts(buffer)
+        for e in token_or_comment_or_line_generator(buffer, starts=starts):
+            self.assertIs(e.line_starts, starts)
+
+        # The line of a mark is found from its line number, unless PyYAML
+        # counted other line breaks than '\n' before it
+        for buffer in ('a: b\n\n- c: d\n',
+                       'a: "b\x85c"\n# d\n\n  e: f\n',
+                       'a: "b\rc"\r\n  d: e\r\n'):
+            starts = line_starts(buffer)
+            for token in yaml.scan(buffer, Loader=yaml.BaseLoader):
+                self.assertEqual(
+                    line_index_of_mark(starts, token.start_mark),
+                    line_index(starts, token.start_mark.pointer))
+
     def test_token_or_comment_generator(self):
         e = list(token_or_comment_generator(''))
         self.assertEqual(len(e), 2)
@@ -140,6 +177,18 @@ class ParserTestCase(unittest.TestCase):
         self.assertFalse(e[8].is_inline())
         self.assertTrue(e[9].is_inline())
 
+        e = [c for c in
+             token_or_comment_generator('url: http://host/#anchor  # 1 # 2\n'
+                                        "'#': \"#\"  #3\n"
+                                        'text: |\n'
+                                        '  # not a comment\n'
+                                        '#5\n')
+             if isinstance(c, Comment)]
+        self.assertEqual(e, [Comment(1, 27, '# 1 # 2', 0),
+                             Comment(2, 11, '#3', 0),
+                             Comment(5, 1, '#5', 0)])
+        self.assertIs(e[1].comment_before, None)
+
     def test_token_or_comment_or_line_generator(self):
         e = list(token_or_comment_or_line_generator('---\n'
                                                     'k: v  # k=v\n'))
@@ -155,3 +204,67 @@ class ParserTestCase(unittest.TestCase):
         self.assertIsInstance(e[8], Comment)
         self.assertIsInstance(e[9], Line)
         self.assertIsInstance(e[12], Line)
+
+    def test_slotted_elements(self):
+        for e in token_or_comment_or_line_generator('---\n'
+                                                    'k: v  # k=v\n'):
+            self.assertFalse(hasattr(e, '__dict__'))
+
+    def test_single_pass_loader(self):
+        for source in (('---\n'
+                        'key: value\n'
+                        'list: [a, {b: c}]\n'),
+                       ('---\n'
+                        'this is not: valid: YAML\n'
+                        'but: scanning goes on\n'),
+                       ('---\n'
+                        'key: "bad \\escape"\n'
+                        'other: value\n'),
+                       # valid for libyaml, but not for PyYAML's scanner
+                       ('---\n'
+                        'key:\tvalue\n'
+                        'other: value\n')):
+            loader = SinglePassLoader(source)
+            try:
+                while loader.pull_token():
+                    pass
+            except yaml.scanner.ScannerError:
+                pass
+            tokens = list(loader.consumed_tokens)
+
+            expected_tokens = []
+            try:
+                expected_tokens.extend(
+                    yaml.scan(source, Loader=yaml.BaseLoader))
+            except yaml.scanner.ScannerError:
+                pass
+            self.assertEqual([type(t) for t in tokens],
+                             [type(t) for t in expected_tokens])
+
+            loader.finish_parsing()
+            try:
+                list(yaml.parse(source, Loader=yaml.BaseLoader))
+            except yaml.error.MarkedYAMLError as e:
+                self.assertEqual(str(loader.syntax_error), str(e))
+            else:
+                self.assertIsNone(loader.syntax_error)
+
+            # Without pulling any token first
+            loader = SinglePassLoader(source)
+            loader.finish_parsing()
+            try:
+                list(yaml.parse(source, Loader=yaml.BaseLoader))
+            except yaml.error.MarkedYAMLError as e:
+                self.assertEqual(str(loader.syntax_error), str(e))
+            else:
+                self.assertIsNone(loader.syntax_error)
+
+    @unittest.skipIf(CBaseLoader is None, 'requires libyaml')
+    def test_is_valid_for_libyaml(self):
+        self.assertTrue(is_valid_for_libyaml('---\n'
+                                             'key: value\n'))
+        self.assertFalse(is_valid_for_libyaml('---\n'
+                                              'this is not: valid: YAML\n'))
+        # Flow collections are left to PyYAML
+        self.assertFalse(is_valid_for_libyaml('---\n'
+                                              'key: [value]\n'))
@@ -13,8 +13,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+from unittest import mock
+
 from tests.common import RuleTestCase
 
+from yamllint import linter
+
 
 class YamlLintTestCase(RuleTestCase):
     rule_id = None  # syntax error
@@ -111,3 +116,46 @@ class YamlLintTestCase(RuleTestCase):
                    '    a:\n'
                    '      set\n'
                    '...\n', None)
+
+    def test_same_errors_without_libyaml(self):
+        # libyaml is only used to tell that a buffer is valid: syntax errors
+        # must have the same positions and messages with or without it.
+        sources = [
+            '---\nthis is not: valid: YAML\n',
+            '---\nthis is: valid YAML\n\nthis is an error: [\n\n...\n',
+            '%YAML 1.2\n%TAG ! tag:clarkevans.com,2002:\ndoc: ument\n...\n',
+            '---\nkey: val\x00ue\n',
+            '---\ntrailing:   \noops\x00\n',
+            '---\nkey:\tvalue\n',
+            '---\nkey: value\n - item\n',
+            '---\n- item\nkey: value\n',
+            '---\nkey: &anchor\n*alias: value\n',
+            '---\nblock: |#\n  text\n',
+            '%YAML 1.2\n%YAML 1.2\n---\n',
+            '%YAML 2.0\n---\n',
+            '---\n!e!tag value\n',
+            '--- a\n  b: c\n',
+            '---\n? key\n: - value 1\n  - value 2\n...\n',
+            '---\n"unterminated\n',
+            '---\nok: 1\n...\n---\nnot: ok: 2\n',
+        ]
+        spec_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                'yaml-1.2-spec-examples')
+        for file in sorted(os.listdir(spec_dir)):
+            with open(os.path.join(spec_dir, file), encoding='utf-8') as f:
+                sources.append(f.read())
+
+        conf = self.build_fake_config(None)
+        for source in sources:
+            with mock.patch('yamllint.parser.CBaseLoader', None):
+                expected = [(p.line, p.column, p.desc, p.rule)
+                            for p in linter.run(source, conf)]
+            self.assertEqual([(p.line, p.column, p.desc, p.rule)
+                              for p in linter.run(source, conf)],
+                             expected, source)
+            with mock.patch('yamllint.parser.CBaseLoader', None):
+                expected = linter.get_syntax_error(source)
+            problem = linter.get_syntax_error(source)
+            self.assertEqual(
+                problem and (problem.line, problem.column, problem.desc),
+                expected and (expected.line, expected.column, expected.desc))
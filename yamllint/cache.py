@@ -0,0 +1,173 @@
+# Copyright (C) 2026 Adrien Vergé
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from yamllint import APP_VERSION
+
+MAX_AGE = 30 * 24 * 3600  # 30 days
+MAX_SIZE = 64 * 1024 * 1024  # 64 MiB
+
+# Names of the files written in the cache directory: entries, and temporary
+# files not yet renamed to entries. Other files are never removed, in case the
+# directory is shared with something else.
+ENTRY_PATTERN = re.compile(r'\.?[0-9a-f]{64}\.(?:json|[^.]+\.tmp)')
+
+
+def default_cache_dir():
+    if 'XDG_CACHE_HOME' in os.environ:
+        return os.path.join(os.environ['XDG_CACHE_HOME'], 'yamllint')
+    return os.path.expanduser('~/.cache/yamllint')
+
+
+class ProblemCache:
+    """On-disk cache of the problems found in files.
+
+    Entries are keyed on the raw content of the file, the configuration of
+    the rules enabled for this file, and the version of yamllint. Each entry
+    is written to a temporary file then atomically renamed, so several
+    yamllint processes can safely share the same cache directory.
+    """
+    def __init__(self, directory, max_age=MAX_AGE, max_size=MAX_SIZE):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_size = max_size
+
+    def key(self, content, conf, filepath):
+        rules = {}
+        for rule in conf.enabled_rules(filepath):
+            rules[rule.ID] = {
+                option: value
+                for option, value in conf.rules[rule.ID].items()
+                if option not in ('ignore', 'ignore-from-file')}
+
+        h = hashlib.sha256()
+        h.update(json.dumps({
+            'version': APP_VERSION,
+            'rules': rules,
+            'locale': conf.locale,
+            'encoding': os.environ.get('YAMLLINT_FILE_ENCODING'),
+        }, sort_keys=True, default=repr).encode())
+        h.update(b'\0')
+        h.update(content)
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key):
+        from yamllint import linter  # noqa: PLC0415
+
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entries = json.load(f)
+            problems = []
+            for line, column, desc, rule, level in entries:
+                problem = linter.LintProblem(line, column, desc, rule)
+                problem.level = level
+                problems.append(problem)
+        except (OSError, ValueError, TypeError):
+            return None
+
+        try:
+            # Mark the entry as recently used, for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return problems
+
+    def set(self, key, problems):
+        entries = [(p.line, p.column, p.desc, p.rule, p.level)
+                   for p in problems]
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory,
+                                            prefix=f'.{key}.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # The cache is only an optimization, failing to write to it should
+            # not prevent linting.
+            pass
+
+    def run(self, content, conf, filepath):
+        """Lints a buffer of bytes, reusing cached results if possible.
+
+        Returns a list of LintProblem objects.
+        """
+        from yamllint import linter  # noqa: PLC0415
+
+        if conf.is_file_ignored(filepath):
+            return []
+
+        key = self.key(content, conf, filepath)
+        problems = self.get(key)
+        if problems is None:
+            problems = list(linter.run(content, conf, filepath))
+            self.set(key, problems)
+        return problems
+
+    def prune(self):
+        """Evicts entries not used for too long, then the least recently used
+        ones until the cache fits in its maximum size."""
+        entries = []
+        now = time.time()
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not ENTRY_PATTERN.fullmatch(entry.name):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        total_size = 0
+        kept = []
+        for mtime, size, path in entries:
+            if now - mtime > self.max_age:
+                self._remove(path)
+            else:
+                total_size += size
+                kept.append((mtime, size, path))
+
+        kept.sort()
+        for _mtime, size, path in kept:
+            if total_size <= self.max_size:
+                break
+            self._remove(path)
+            total_size -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            # Already removed by a concurrent process
+            pass
@@ -13,31 +13,181 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+# Modules that are slow to import (yaml, pathspec, the linter and its rules...)
+# are only imported by the functions that need them, so that commands like
+# `yamllint --version` start fast.
+
 import argparse
+import contextlib
 import locale
 import os
-import platform
 import sys
 
-from yamllint import APP_DESCRIPTION, APP_NAME, APP_VERSION, linter
-from yamllint.config import YamlLintConfig, YamlLintConfigError
-from yamllint.linter import PROBLEM_LEVELS
+from yamllint import APP_DESCRIPTION, APP_NAME, APP_VERSION, cache, daemon
 
 
 def find_files_recursively(items, conf):
     for item in items:
         if os.path.isdir(item):
-            for root, _dirnames, filenames in os.walk(item):
-                for f in filenames:
-                    filepath = os.path.join(root, f)
-                    if (conf.is_yaml_file(filepath) and
-                            not conf.is_file_ignored(filepath)):
-                        yield filepath
+            yield from walk_yaml_files(item, conf)
         else:
             yield item
 
 
+def walk_yaml_files(top, conf):
+    """Yields YAML files under a directory, in the same order as os.walk().
+
+    Ignored directories are not walked into. Like os.walk(), symbolic links to
+    directories are not followed and unreadable directories are skipped.
+    """
+    dirs = [top]
+    while dirs:
+        root = dirs.pop()
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            path = os.path.join(root, entry.name)
+            # DirEntry caches the file type, so this does not require a stat()
+            # call on most platforms.
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                try:
+                    is_symlink = entry.is_symlink()
+                except OSError:
+                    is_symlink = False
+                if not is_symlink and not conf.is_directory_ignored(path):
+                    subdirs.append(path)
+            elif conf.is_yaml_file(path) and not conf.is_file_ignored(path):
+                yield path
+
+        dirs.extend(reversed(subdirs))
+
+
+def read_file_list(path, separator):
+    """Yields the paths listed in a file ("-" for standard input).
+
+    The file is read as it comes, so that linting can start before the whole
+    list is written (for instance by `find` or `git ls-files`).
+    """
+    with (open(path, mode='rb') if path != '-' else
+          contextlib.nullcontext(sys.stdin.buffer)) as f:
+        rest = b''
+        while chunk := f.read1(64 * 1024):
+            *paths, rest = (rest + chunk).split(separator)
+            yield from _decode_paths(paths, separator)
+        yield from _decode_paths((rest, ), separator)
+
+
+def _decode_paths(paths, separator):
+    for path in paths:
+        if separator == b'\n':
+            # Lists written on Windows have lines ending with "\r\n"
+            path = path.removesuffix(b'\r')
+        if path:
+            yield os.fsdecode(path)
+
+
+def lint_file(file, conf, problem_cache=None, per_document=False):
+    from yamllint import linter  # noqa: PLC0415
+
+    filepath = file.removeprefix('./')
+    if per_document:
+        # Open the file now, so that errors are raised here as in other cases
+        return _lint_stream(open(file, mode='rb'), conf, filepath)
+    with open(file, mode='rb') as f:
+        if problem_cache is None:
+            return linter.run(f, conf, filepath)
+        content = f.read()
+    return problem_cache.run(content, conf, filepath)
+
+
+def _lint_stream(f, conf, filepath):
+    from yamllint import linter  # noqa: PLC0415
+
+    # The file stays open while documents are read and linted
+    with f:
+        yield from linter.run(f, conf, filepath, per_document=True)
+
+
+_worker_conf = None
+_worker_cache = None
+_worker_per_document = False
+
+
+def _init_worker(conf, problem_cache, per_document):
+    global _worker_conf, _worker_cache, _worker_per_document
+    _worker_conf = conf
+    _worker_cache = problem_cache
+    _worker_per_document = per_document
+    if conf.locale is not None:
+        locale.setlocale(locale.LC_ALL, conf.locale)
+
+
+def _lint_file_in_worker(file):
+    # Errors are returned rather than raised, so that they don't discard the
+    # results of other files processed in the same chunk.
+    try:
+        return list(lint_file(file, _worker_conf, _worker_cache,
+                              _worker_per_document)), None
+    except OSError as e:
+        return None, e
+
+
+def lint_files(files, conf, jobs=1, problem_cache=None, per_document=False):
+    """Lints files, possibly in parallel.
+
+    Yields (file, problems) tuples in the same order as ``files``, whatever the
+    number of jobs. If a file cannot be read, the OSError is raised when this
+    file is reached.
+    """
+    if jobs == 1:
+        for file in files:
+            yield file, lint_file(file, conf, problem_cache, per_document)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    files = list(files)
+    executor = ProcessPoolExecutor(max_workers=jobs,
+                                   initializer=_init_worker,
+                                   initargs=(conf, problem_cache,
+                                             per_document))
+    try:
+        for file, (problems, error) in zip(
+                files, executor.map(_lint_file_in_worker, files,
+                                    chunksize=8), strict=True):
+            if error is not None:
+                raise error
+            yield file, problems
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def jobs_count(value):
+    if value == 'auto':
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(
+            f'should be a positive integer or "auto", not "{value}"')
+    return jobs
+
+
 def supports_color():
+    import platform  # noqa: PLC0415
+
     supported_platform = not (platform.system() == 'Windows' and not
                               ('ANSICON' in os.environ or
                                ('TERM' in os.environ and
@@ -49,8 +199,11 @@ def supports_color():
 class Format:
     @staticmethod
     def parsable(problem, filename):
+        if problem.rule is None:
+            return (f'{filename}:{problem.line}:{problem.column}: '
+                    f'[{problem.level}] {problem.desc}')
         return (f'{filename}:{problem.line}:{problem.column}: '
-                f'[{problem.level}] {problem.message}')
+                f'[{problem.level}] {problem.desc} ({problem.rule})')
 
     @staticmethod
     def standard(problem, filename):
@@ -79,18 +232,29 @@ class Format:
 
     @staticmethod
     def github(problem, filename):
-        line = (f'::{problem.level} file={filename},'
+        if not problem.rule:
+            return (f'::{problem.level} file={filename},'
+                    f'line={problem.line},col={problem.column}'
+                    f'::{problem.line}:{problem.column} {problem.desc}')
+        return (f'::{problem.level} file={filename},'
                 f'line={problem.line},col={problem.column}'
-                f'::{problem.line}:{problem.column} ')
-        if problem.rule:
-            line += f'[{problem.rule}] '
-        line += problem.desc
-        return line
+                f'::{problem.line}:{problem.column} '
+                f'[{problem.rule}] {problem.desc}')
+
+
+# Maximum number of lines kept before writing them, when showing problems
+OUTPUT_BATCH_SIZE = 4096
 
 
 def show_problems(problems, file, args_format, no_warn):
+    """Writes the problems found in a file, and returns their maximum level.
+
+    Lines are formatted into a buffer, written at once (or by batches for
+    files with very many problems), as writing them one by one is slow.
+    """
+    from yamllint.linter import PROBLEM_LEVELS  # noqa: PLC0415
+
     max_level = 0
-    first = True
 
     if args_format == 'auto':
         if ('GITHUB_ACTIONS' in os.environ and
@@ -99,33 +263,38 @@ def show_problems(problems, file, args_format, no_warn):
         elif supports_color():
             args_format = 'colored'
 
-    for problem in problems:
-        max_level = max(max_level, PROBLEM_LEVELS[problem.level])
-        if no_warn and (problem.level != 'error'):
-            continue
-        if args_format == 'parsable':
-            print(Format.parsable(problem, file))
-        elif args_format == 'github':
-            if first:
-                print(f'::group::{file}')
-                first = False
-            print(Format.github(problem, file))
-        elif args_format == 'colored':
-            if first:
-                print(f'\033[4m{file}\033[0m')
-                first = False
-            print(Format.standard_color(problem, file))
-        else:
-            if first:
-                print(file)
-                first = False
-            print(Format.standard(problem, file))
-
-    if not first and args_format == 'github':
-        print('::endgroup::')
+    if args_format == 'parsable':
+        format_problem, header, footer = Format.parsable, None, ()
+    elif args_format == 'github':
+        format_problem, header, footer = (Format.github, f'::group::{file}',
+                                          ('::endgroup::', ''))
+    elif args_format == 'colored':
+        format_problem, header, footer = (Format.standard_color,
+                                          f'\033[4m{file}\033[0m', ('', ))
+    else:
+        format_problem, header, footer = Format.standard, file, ('', )
 
-    if not first and args_format != 'parsable':
-        print('')
+    lines = []
+    shown = False
+    try:
+        for problem in problems:
+            max_level = max(max_level, PROBLEM_LEVELS[problem.level])
+            if no_warn and (problem.level != 'error'):
+                continue
+            if not shown:
+                shown = True
+                if header is not None:
+                    lines.append(header)
+            lines.append(format_problem(problem, file))
+            if len(lines) >= OUTPUT_BATCH_SIZE:
+                sys.stdout.write('\n'.join(lines) + '\n')
+                lines.clear()
+
+        if shown:
+            lines.extend(footer)
+    finally:
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
 
     return max_level
 
@@ -152,6 +321,19 @@ def run(argv=None):
                              help='files to check')
     files_group.add_argument('-', action='store_true', dest='stdin',
                              help='read from standard input')
+    files_group.add_argument('--daemon', nargs='?',
+                             const=daemon.socket_path(),
+                             metavar='SOCKET',
+                             help='serve lint requests from yamllint-client '
+                                  'on a Unix socket (default: '
+                                  '$YAMLLINT_DAEMON_SOCKET, or '
+                                  '$XDG_RUNTIME_DIR/yamllint.sock)')
+    files_group.add_argument('--files-from', metavar='FILE',
+                             help='read the list of files to check from FILE '
+                                  '("-" for standard input), one per line')
+    parser.add_argument('-0', '--null', action='store_true',
+                        help='files listed in --files-from are separated by '
+                             'NUL characters rather than new lines')
     config_group = parser.add_mutually_exclusive_group()
     config_group.add_argument('-c', '--config-file', dest='config_file',
                               action='store',
@@ -172,11 +354,62 @@ def run(argv=None):
     parser.add_argument('--no-warnings',
                         action='store_true',
                         help='output only error level problems')
+    parser.add_argument('-j', '--jobs', type=jobs_count, default=1,
+                        metavar='N',
+                        help='number of files to lint in parallel ("auto" to '
+                             'use as many processes as CPUs)')
+    reading_group = parser.add_mutually_exclusive_group()
+    reading_group.add_argument('--cache', action='store_true',
+                               help='reuse results of previous runs for '
+                                    'unchanged files')
+    reading_group.add_argument('--per-document', action='store_true',
+                               help='read and lint documents one at a time, '
+                                    'to keep memory use low on very large '
+                                    'multi-document streams')
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help='directory where --cache stores results '
+                             '(default: ~/.cache/yamllint), implies --cache')
     parser.add_argument('-v', '--version', action='version',
                         version=f'{APP_NAME} {APP_VERSION}')
 
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # "-" is an option, argparse would not take it as the value of another one
+    for i, arg in enumerate(argv[:-1]):
+        if arg == '--files-from' and argv[i + 1] == '-':
+            argv[i:i + 2] = ['--files-from=-']
+            break
+
     args = parser.parse_args(argv)
 
+    if args.daemon is not None:
+        if daemon.running_for_client:
+            parser.error('argument --daemon: not allowed through '
+                         'yamllint-client')
+        try:
+            daemon.serve(args.daemon)
+        except OSError as e:
+            print(e, file=sys.stderr)
+            sys.exit(-1)
+        sys.exit(0)
+
+    if args.cache_dir is not None:
+        if args.per_document:
+            parser.error('argument --cache-dir: not allowed with argument '
+                         '--per-document')
+        args.cache = True
+
+    if args.files_from is not None:
+        args.files = read_file_list(args.files_from,
+                                    b'\0' if args.null else b'\n')
+    elif args.null:
+        parser.error('argument -0/--null: only allowed with --files-from')
+
+    from yamllint import linter  # noqa: PLC0415
+    from yamllint.config import (  # noqa: PLC0415
+        YamlLintConfig,
+        YamlLintConfigError,
+    )
+
     if 'YAMLLINT_CONFIG_FILE' in os.environ:
         user_global_config = os.path.expanduser(
             os.environ['YAMLLINT_CONFIG_FILE'])
@@ -209,24 +442,41 @@ def run(argv=None):
         locale.setlocale(locale.LC_ALL, conf.locale)
 
     if args.list_files:
-        for file in find_files_recursively(args.files, conf):
-            if not conf.is_file_ignored(file):
-                print(file)
-        sys.exit(0)
-
-    max_level = 0
-
-    for file in find_files_recursively(args.files, conf):
-        filepath = file.removeprefix('./')
         try:
-            with open(file, mode='rb') as f:
-                problems = linter.run(f, conf, filepath)
+            for file in find_files_recursively(args.files, conf):
+                if not conf.is_file_ignored(file):
+                    print(file)
         except OSError as e:
             print(e, file=sys.stderr)
             sys.exit(-1)
-        prob_level = show_problems(problems, file, args_format=args.format,
-                                   no_warn=args.no_warnings)
-        max_level = max(max_level, prob_level)
+        sys.exit(0)
+
+    max_level = 0
+
+    problem_cache = None
+    if args.cache:
+        problem_cache = cache.ProblemCache(args.cache_dir or
+                                           cache.default_cache_dir())
+
+    results = lint_files(find_files_recursively(args.files, conf), conf,
+                         jobs=args.jobs, problem_cache=problem_cache,
+                         per_document=args.per_document)
+    with contextlib.closing(results):
+        while True:
+            try:
+                file, problems = next(results, (None, None))
+            except OSError as e:
+                print(e, file=sys.stderr)
+                sys.exit(-1)
+            if file is None:
+                break
+            prob_level = show_problems(problems, file,
+                                       args_format=args.format,
+                                       no_warn=args.no_warnings)
+            max_level = max(max_level, prob_level)
+
+    if problem_cache is not None:
+        problem_cache.prune()
 
     # read yaml from stdin
     if args.stdin:
@@ -234,7 +484,8 @@ def run(argv=None):
             # The .buffer part makes sure that we get the raw bytes. We need to
             # get the raw bytes so that we can autodetect the character
             # encoding.
-            problems = linter.run(sys.stdin.buffer, conf, '')
+            problems = linter.run(sys.stdin.buffer, conf, '',
+                                  per_document=args.per_document)
         except OSError as e:
             print(e, file=sys.stderr)
             sys.exit(-1)
@@ -242,9 +493,9 @@ def run(argv=None):
                                    no_warn=args.no_warnings)
         max_level = max(max_level, prob_level)
 
-    if max_level == PROBLEM_LEVELS['error']:
+    if max_level == linter.PROBLEM_LEVELS['error']:
         return_code = 1
-    elif max_level == PROBLEM_LEVELS['warning']:
+    elif max_level == linter.PROBLEM_LEVELS['warning']:
         return_code = 2 if args.strict else 0
     else:
         return_code = 0
@@ -37,37 +37,107 @@ class YamlLintConfig:
 
         self.locale = None
 
+        # Enabled rules for files, computed on demand by enabled_rules()
+        self._enabled_rules = None
+
+        # Files this configuration was read from, with their state at that
+        # time, to tell whether it is still up to date. None if it also
+        # depends on other files (e.g. ignore-from-file).
+        self.sources = []
+        # Names of the configurations this one extends (recursively), with the
+        # real paths they were found at. Relative names depend on the working
+        # directory.
+        self.extended = []
+
         if file is not None:
+            self.sources.append((os.path.realpath(file), file_state(file)))
             with open(file, mode='rb') as f:
                 content = decoder.auto_decode(f.read())
 
         self.parse(content)
         self.validate()
 
+    def __getstate__(self):
+        # Rule modules kept for enabled_rules() cannot be pickled (e.g. to be
+        # sent to worker processes): they are looked up again after unpickling
+        state = self.__dict__.copy()
+        for name in ('_enabled_rules_last', '_ignore_specs', '_rule_groups'):
+            state.pop(name, None)
+        state['_enabled_rules'] = None
+        return state
+
     def is_file_ignored(self, filepath):
         return self.ignore and self.ignore.match_file(filepath)
 
+    def is_directory_ignored(self, dirpath):
+        """Tells whether all files under this directory are ignored.
+
+        With gitignore-style patterns, a pattern matching a directory matches
+        all files under it too, unless a negation pattern re-includes some of
+        them.
+        """
+        return bool(self.ignore and
+                    all(p.include is not False for p in self.ignore.patterns)
+                    and self.ignore.match_file(os.path.join(dirpath, '')))
+
     def is_yaml_file(self, filepath):
         return self.yaml_files.match_file(os.path.basename(filepath))
 
     def enabled_rules(self, filepath):
-        return [yamllint.rules.get(id) for id, val in self.rules.items()
-                if val is not False and (
-                    filepath is None or 'ignore' not in val or
-                    not val['ignore'].match_file(filepath))]
+        """Returns the rules enabled for a file, as a list.
+
+        Rules sharing the same ignore patterns are grouped, so that these
+        patterns are only matched once per file. Results are kept per set of
+        groups that ignore the file, and for the last file asked.
+        """
+        if self._enabled_rules is None:
+            self._group_rules_by_ignore()
+        elif filepath == self._enabled_rules_last[0]:
+            return list(self._enabled_rules_last[1])
+
+        ignoring = () if filepath is None else tuple(
+            i for i, spec in enumerate(self._ignore_specs)
+            if spec.match_file(filepath))
+        try:
+            rules = self._enabled_rules[ignoring]
+        except KeyError:
+            rules = self._enabled_rules[ignoring] = tuple(
+                rule for rule, group in self._rule_groups
+                if group not in ignoring)
+        self._enabled_rules_last = (filepath, rules)
+        return list(rules)
+
+    def _group_rules_by_ignore(self):
+        self._ignore_specs = []
+        self._rule_groups = []
+        for id, val in self.rules.items():
+            if val is False:
+                continue
+            group = None
+            if 'ignore' in val:
+                # GitIgnoreSpec objects are not hashable, but comparable
+                if val['ignore'] not in self._ignore_specs:
+                    self._ignore_specs.append(val['ignore'])
+                group = self._ignore_specs.index(val['ignore'])
+            self._rule_groups.append((yamllint.rules.get(id), group))
+        self._enabled_rules = {}
+        self._enabled_rules_last = (object(), None)
 
     def extend(self, base_config):
         assert isinstance(base_config, YamlLintConfig)
 
+        # Work on copies, base_config may be shared with other configurations
+        rules = {id: dict(val) if isinstance(val, dict) else val
+                 for id, val in base_config.rules.items()}
         for rule in self.rules:
             if (isinstance(self.rules[rule], dict) and
-                    rule in base_config.rules and
-                    base_config.rules[rule] is not False):
-                base_config.rules[rule].update(self.rules[rule])
+                    rule in rules and rules[rule] is not False):
+                rules[rule].update(self.rules[rule])
             else:
-                base_config.rules[rule] = self.rules[rule]
+                rules[rule] = self.rules[rule]
 
-        self.rules = base_config.rules
+        self.rules = rules
+        self._enabled_rules = None
 
         if base_config.ignore is not None:
             self.ignore = base_config.ignore
@@ -94,7 +164,14 @@ class YamlLintConfig:
         # Does this conf override another conf that we need to load?
         if 'extends' in conf:
             path = get_extended_config_file(conf['extends'])
-            base = YamlLintConfig(file=path)
+            base = load_extended_config(path)
+            if self.sources is not None and base.sources is not None:
+                self.sources.extend(base.sources)
+                self.extended.append((conf['extends'],
+                                      os.path.realpath(path)))
+                self.extended.extend(base.extended)
+            else:
+                self.sources = None
             try:
                 self.extend(base)
             except Exception as e:
@@ -115,6 +192,7 @@ class YamlLintConfig:
             self.ignore = GitIgnoreSpec.from_lines(
                 decoder.lines_in_files(conf['ignore-from-file'])
             )
+            self.sources = None
         elif 'ignore' in conf:
             if isinstance(conf['ignore'], str):
                 self.ignore = GitIgnoreSpec.from_lines(
@@ -141,13 +219,20 @@ class YamlLintConfig:
             self.locale = conf['locale']
 
     def validate(self):
+        self._enabled_rules = None
         for id in self.rules:
+            if self.rules[id] is False and yamllint.rules.exists(id):
+                continue  # don't import disabled rules
+
             try:
                 rule = yamllint.rules.get(id)
             except Exception as e:
                 raise YamlLintConfigError(f'invalid config: {e}') from e
 
             self.rules[id] = validate_rule_conf(rule, self.rules[id])
+            if (isinstance(self.rules[id], dict) and
+                    'ignore-from-file' in self.rules[id]):
+                self.sources = None
 
 
 def validate_rule_conf(rule, conf):
@@ -247,3 +332,42 @@ def get_extended_config_file(name):
 
     # or a custom conf on filesystem?
     return name
+
+
+def file_state(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def is_up_to_date(conf):
+    """Tells whether a configuration is the same as when it was read: its files
+    did not change, and the configurations it extends are still found at the
+    same paths (from the current working directory)."""
+    try:
+        return (all(file_state(path) == state
+                    for path, state in conf.sources) and
+                all(os.path.realpath(get_extended_config_file(name)) == path
+                    for name, path in conf.extended))
+    except OSError:
+        return False
+
+
+_extended_configs = {}
+
+
+def load_extended_config(path):
+    """Loads a configuration file to be extended.
+
+    Configurations are cached for the whole process, and only read and
+    validated again when one of the files they come from changed. The returned
+    object is shared and must not be modified.
+    """
+    key = os.path.realpath(path)
+    conf = _extended_configs.get(key)
+    if conf is None or not is_up_to_date(conf):
+        conf = YamlLintConfig(file=path)
+        if conf.sources is not None:
+            _extended_configs[key] = conf
+        else:
+            _extended_configs.pop(key, None)
+    return conf
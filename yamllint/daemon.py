@@ -0,0 +1,272 @@
+# Copyright (C) 2026 Adrien Vergé
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Persistent lint server, and the thin client that talks to it.
+
+``yamllint --daemon`` listens on a Unix socket. ``yamllint-client`` takes the
+same arguments as ``yamllint``, sends them to the server together with its
+working directory, the environment variables yamllint uses and standard input,
+then replays the output and exit code of the server. As the server runs the
+usual command-line code, the output is the same as with the one-shot
+``yamllint``.
+
+The socket is only usable by its owner, in a directory that other users cannot
+write to, and the client checks both before sending anything.
+
+This module is imported by the client, so it must stay cheap to import: the
+linter itself is only imported by the server.
+"""
+
+import io
+import json
+import locale
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+
+STDOUT = 1
+STDERR = 2
+
+# Environment variables that change the behavior of yamllint, sent by the
+# client. Others (that may hold secrets) are not.
+ENVIRONMENT_VARIABLES = (
+    'ANSICON', 'GITHUB_ACTIONS', 'GITHUB_WORKFLOW', 'HOME', 'LANG', 'LC_ALL',
+    'LC_COLLATE', 'LC_CTYPE', 'TERM', 'XDG_CACHE_HOME', 'XDG_CONFIG_HOME',
+    'YAMLLINT_CONFIG_FILE', 'YAMLLINT_FILE_ENCODING',
+)
+
+# True while running a command line given to yamllint-client, by the daemon
+# or by the client itself when no daemon is running
+running_for_client = False
+
+
+def default_socket_path():
+    if 'XDG_RUNTIME_DIR' in os.environ:
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], 'yamllint.sock')
+    return os.path.join(tempfile.gettempdir(), f'yamllint-{os.getuid()}',
+                        'yamllint.sock')
+
+
+def socket_path():
+    return os.environ.get('YAMLLINT_DAEMON_SOCKET') or default_socket_path()
+
+
+def _check_private(path, mode_mask):
+    st = os.stat(path)
+    if st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) & mode_mask:
+        raise PermissionError(f'{path} is not private to the current user')
+
+
+def _check_socket(path):
+    """Raises PermissionError if other users could have created or replaced
+    the socket, or could talk to the daemon."""
+    _check_private(os.path.dirname(os.path.abspath(path)), 0o022)
+    _check_private(path, 0o077)
+
+
+class _Output(io.TextIOBase):
+    """Records what is written to stdout or stderr, in order."""
+    def __init__(self, chunks, stream, isatty):
+        self._chunks = chunks
+        self._stream = stream
+        self._isatty = isatty
+
+    def isatty(self):
+        return self._isatty
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        self._chunks.append((self._stream, s))
+        return len(s)
+
+
+def run_request(request, stdin):
+    """Runs the command line of a client, as if it were run by the client.
+
+    Returns a response holding the output chunks and the exit code.
+    """
+    from yamllint import cli  # noqa: PLC0415
+
+    global running_for_client
+
+    chunks = []
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_locale = locale.setlocale(locale.LC_ALL)
+    running_for_client = True
+    try:
+        os.environ.clear()
+        os.environ.update(request['env'])
+        os.chdir(request['cwd'])
+        sys.stdin = io.TextIOWrapper(io.BytesIO(stdin), encoding='utf-8')
+        sys.stdout = _Output(chunks, STDOUT, request['isatty'])
+        sys.stderr = _Output(chunks, STDERR, False)
+
+        try:
+            cli.run(request['argv'])
+            code = 0
+        except SystemExit as e:
+            if e.code is None:
+                code = 0
+            elif isinstance(e.code, int):
+                code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+    finally:
+        running_for_client = False
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        locale.setlocale(locale.LC_ALL, saved_locale)
+
+    return {'output': chunks, 'code': code}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        stdin = self.rfile.read()
+        response = run_request(request, stdin)
+        self.wfile.write(json.dumps(response).encode())
+
+
+class Server(socketserver.UnixStreamServer):
+    """Lint server listening on a Unix socket.
+
+    Requests are handled one at a time, because running one changes
+    process-wide state (working directory, environment, standard streams).
+    """
+    def __init__(self, path):
+        super().__init__(path, _Handler)
+
+    def server_bind(self):
+        # Other users must not be able to make us read files on their behalf
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+
+def _remove_stale_socket(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(path)
+        except FileNotFoundError:
+            return
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise OSError(f'a yamllint daemon is already listening on {path}')
+
+
+def serve(path):
+    """Serves lint requests on a Unix socket, until interrupted."""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    _check_private(directory, 0o022)
+    _remove_stale_socket(path)
+    server = Server(path)
+    # Stop cleanly on SIGTERM too
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def send_request(path, argv, stdin=b''):
+    """Sends a command line to the daemon listening on path.
+
+    Returns the response, or raises OSError if no daemon is listening, or if
+    the socket could belong to another user.
+    """
+    request = {
+        'argv': argv,
+        'cwd': os.getcwd(),
+        'env': {name: os.environ[name] for name in ENVIRONMENT_VARIABLES
+                if name in os.environ},
+        'isatty': hasattr(sys.stdout, 'isatty') and sys.stdout.isatty(),
+    }
+    _check_socket(path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall(json.dumps(request).encode() + b'\n')
+        s.sendall(stdin)
+        s.shutdown(socket.SHUT_WR)
+        with s.makefile('rb') as f:
+            data = f.read()
+    if not data:
+        raise ConnectionResetError(f'no response from yamllint daemon on '
+                                   f'{path}')
+    return json.loads(data)
+
+
+def client(argv=None):
+    """Entry point of ``yamllint-client``.
+
+    If no daemon is running, falls back to linting in this process.
+    """
+    global running_for_client
+
+    if argv is None:
+        argv = sys.argv[1:]
+    argv = list(argv)
+
+    # Standard input is read by `yamllint -` and `yamllint --files-from -`
+    reads_stdin = '-' in argv or '--files-from=-' in argv
+    stdin = b''
+    if reads_stdin:
+        stdin = sys.stdin.buffer.read()
+
+    try:
+        response = send_request(socket_path(), argv, stdin)
+    except OSError:
+        from yamllint import cli  # noqa: PLC0415
+
+        if reads_stdin:
+            sys.stdin = io.TextIOWrapper(io.BytesIO(stdin), encoding='utf-8')
+        # Even without a daemon, the client must not become one
+        running_for_client = True
+        try:
+            cli.run(argv)
+        finally:
+            running_for_client = False
+        return
+
+    for stream, text in response['output']:
+        (sys.stdout if stream == STDOUT else sys.stderr).write(text)
+    sys.exit(response['code'])
@@ -13,7 +13,10 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import codecs
+import heapq
 import io
+import operator
 import re
 
 import yaml
@@ -35,6 +38,8 @@ ENABLE_RULE_PATTERN = re.compile(r'^# yamllint enable( rule:\S+)*\s*$')
 
 class LintProblem:
     """Represents a linting problem found by yamllint."""
+    __slots__ = ('column', 'desc', 'level', 'line', 'rule')
+
     def __init__(self, line, column, desc='<no description>', rule=None):
         #: Line on which the problem was found (starting at 1)
         self.line = line
@@ -65,22 +70,55 @@ class LintProblem:
         return f'{self.line}:{self.column}: {self.message}'
 
 
-def get_cosmetic_problems(buffer, conf, filepath):
+def get_cosmetic_problems(buffer, conf, filepath, loader=None,
+                          disabled_rules=None, context=None):
+    """Yields the problems found by cosmetic rules.
+
+    disabled_rules is an optional set of rule IDs disabled by ``# yamllint
+    disable`` comments before the buffer, and context an optional mapping of
+    rule IDs to the contexts of token rules after previous buffers of the same
+    stream. Both are updated in place.
+    """
     rules = conf.enabled_rules(filepath)
 
-    # Split token rules from line rules
-    token_rules = [r for r in rules if r.TYPE == 'token']
-    comment_rules = [r for r in rules if r.TYPE == 'comment']
-    line_rules = [r for r in rules if r.TYPE == 'line']
-
-    context = {}
-    for rule in token_rules:
-        context[rule.ID] = {}
+    # Split token rules from line rules, along with their configurations
+    token_rules = [(r, conf.rules[r.ID]) for r in rules if r.TYPE == 'token']
+    comment_rules = [(r, conf.rules[r.ID]) for r in rules
+                     if r.TYPE == 'comment']
+    line_rules = [(r, conf.rules[r.ID]) for r in rules if r.TYPE == 'line']
+
+    if context is None:
+        context = {}
+    # Nesting of collections, kept once for all token rules. Token rules get
+    # PyYAML tokens, so they also find the line starts of the buffer (which
+    # Line, Token and Comment objects hold) in their context.
+    structure = parser.Structure()
+    starts = parser.line_starts(buffer)
+    for rule, _ in token_rules:
+        rule_context = context.setdefault(rule.ID, {})
+        rule_context['structure'] = structure
+        rule_context['line_starts'] = starts
+
+    # Token rules can declare the PyYAML token classes they act on in
+    # TOKEN_TYPES, so that they are not called for other tokens. Rules that
+    # don't are called for every token. The list of rules to call is computed
+    # once per token class, keeping the order of rules.
+    token_rules_by_type = {}
+
+    def token_rules_for(token_type):
+        if token_type not in token_rules_by_type:
+            token_rules_by_type[token_type] = [
+                (rule, rule_conf) for rule, rule_conf in token_rules
+                if (not hasattr(rule, 'TOKEN_TYPES') or
+                    issubclass(token_type, rule.TOKEN_TYPES))]
+        return token_rules_by_type[token_type]
+
+    all_rule_ids = {r.ID for r in rules}
 
     class DisableDirective:
-        def __init__(self):
-            self.rules = set()
-            self.all_rules = {r.ID for r in rules}
+        def __init__(self, disabled=None):
+            self.rules = set() if disabled is None else disabled
+            self.all_rules = all_rule_ids
 
         def process_comment(self, comment):
             comment = str(comment)
@@ -89,7 +127,7 @@ def get_cosmetic_problems(buffer, conf, filepath):
                 items = comment[18:].rstrip().split(' ')
                 rules = [item[5:] for item in items][1:]
                 if len(rules) == 0:
-                    self.rules = self.all_rules.copy()
+                    self.rules.update(self.all_rules)
                 else:
                     for id in rules:
                         if id in self.all_rules:
@@ -115,7 +153,7 @@ def get_cosmetic_problems(buffer, conf, filepath):
                 items = comment[23:].rstrip().split(' ')
                 rules = [item[5:] for item in items][1:]
                 if len(rules) == 0:
-                    self.rules = self.all_rules.copy()
+                    self.rules.update(self.all_rules)
                 else:
                     for id in rules:
                         if id in self.all_rules:
@@ -125,14 +163,92 @@ def get_cosmetic_problems(buffer, conf, filepath):
     # found. This allows the use of yamllint directive to disable some rules on
     # some lines.
     cache = []
-    disabled = DisableDirective()
+    disabled = DisableDirective(disabled_rules)
     disabled_for_line = DisableLineDirective()
     disabled_for_next_line = DisableLineDirective()
 
-    for elem in parser.token_or_comment_or_line_generator(buffer):
+    def end_of_line():
+        """Returns the problems of the line that ends, that are not disabled
+        by directives."""
+        nonlocal cache, disabled_for_line, disabled_for_next_line
+        problems = [problem for problem in cache
+                    if not (disabled_for_line.is_disabled_by_directive(problem)
+                            or disabled.is_disabled_by_directive(problem))]
+        disabled_for_line = disabled_for_next_line
+        disabled_for_next_line = DisableLineDirective()
+        cache = []
+        return problems
+
+    # Line rules can have a check_buffer() function, that finds in one go the
+    # problems check() would find line by line, in line order. When all line
+    # rules have one, lines are not built.
+    def line_problems_of(rule, rule_conf):
+        for problem in rule.check_buffer(rule_conf, buffer, starts):
+            problem.rule = rule.ID
+            problem.level = rule_conf['level']
+            yield problem
+
+    if all(hasattr(rule, 'check_buffer') for rule, _ in line_rules):
+        line_problems = heapq.merge(
+            *(line_problems_of(rule, rule_conf)
+              for rule, rule_conf in line_rules),
+            key=operator.attrgetter('line'))
+        line_rules = []
+    else:
+        line_problems = iter(())
+    next_line_problem = next(line_problems, None)
+
+    # Only build the streams that enabled rules need. Comments are also needed
+    # for directives, but without '# yamllint' in the buffer there is none.
+    need_tokens = bool(token_rules or comment_rules or
+                       '# yamllint' in buffer)
+    if not need_tokens:
+        # The syntax error (if any) must still be found, and be known before
+        # cosmetic problems are given.
+        if loader is not None:
+            loader.finish_parsing()
+        elements = parser.line_generator(buffer, starts) if line_rules else ()
+    elif line_rules:
+        elements = parser.token_or_comment_or_line_generator(buffer, loader,
+                                                             starts)
+    else:
+        elements = parser.token_or_comment_generator(buffer, loader, starts)
+
+    # When lines are not built, their ends are still needed to flush problems:
+    # they are known from line numbers of tokens and comments, and from the
+    # line count of the buffer.
+    line_count = len(starts)
+    line_no = 1
+    lines_ended_since_elem = 0
+
+    def end_lines(last):
+        """Ends the lines up to the given one, when lines are not built."""
+        nonlocal line_no, next_line_problem, lines_ended_since_elem
+        last = min(last, line_count)
+        while line_no <= last:
+            while (next_line_problem is not None and
+                   next_line_problem.line == line_no):
+                cache.append(next_line_problem)
+                next_line_problem = next(line_problems, None)
+            yield from end_of_line()
+            line_no += 1
+            lines_ended_since_elem += 1
+            if lines_ended_since_elem >= 2:
+                # Directives for next lines expired: skip lines where nothing
+                # is found
+                skip_to = last + 1
+                if next_line_problem is not None:
+                    skip_to = min(skip_to, next_line_problem.line)
+                line_no = max(line_no, skip_to)
+
+    for elem in elements:
+        if not line_rules and line_no < elem.line_no:
+            yield from end_lines(elem.line_no - 1)
+        lines_ended_since_elem = 0
+
         if isinstance(elem, parser.Token):
-            for rule in token_rules:
-                rule_conf = conf.rules[rule.ID]
+            structure.update(elem.curr)
+            for rule, rule_conf in token_rules_for(type(elem.curr)):
                 for problem in rule.check(rule_conf,
                                           elem.curr, elem.prev, elem.next,
                                           elem.nextnext,
@@ -141,8 +257,7 @@ def get_cosmetic_problems(buffer, conf, filepath):
                     problem.level = rule_conf['level']
                     cache.append(problem)
         elif isinstance(elem, parser.Comment):
-            for rule in comment_rules:
-                rule_conf = conf.rules[rule.ID]
+            for rule, rule_conf in comment_rules:
                 for problem in rule.check(rule_conf, elem):
                     problem.rule = rule.ID
                     problem.level = rule_conf['level']
@@ -154,8 +269,7 @@ def get_cosmetic_problems(buffer, conf, filepath):
             else:
                 disabled_for_next_line.process_comment(elem)
         elif isinstance(elem, parser.Line):
-            for rule in line_rules:
-                rule_conf = conf.rules[rule.ID]
+            for rule, rule_conf in line_rules:
                 for problem in rule.check(rule_conf, elem):
                     problem.rule = rule.ID
                     problem.level = rule_conf['level']
@@ -163,26 +277,31 @@ def get_cosmetic_problems(buffer, conf, filepath):
 
             # This is the last token/comment/line of this line, let's flush the
             # problems found (but filter them according to the directives)
-            for problem in cache:
-                if not (disabled_for_line.is_disabled_by_directive(problem) or
-                        disabled.is_disabled_by_directive(problem)):
-                    yield problem
+            yield from end_of_line()
 
-            disabled_for_line = disabled_for_next_line
-            disabled_for_next_line = DisableLineDirective()
-            cache = []
+    if not line_rules:
+        yield from end_lines(line_count)
 
 
 def get_syntax_error(buffer):
     try:
-        list(yaml.parse(buffer, Loader=yaml.BaseLoader))
-    except yaml.error.MarkedYAMLError as e:
+        if parser.is_valid_for_libyaml(buffer):
+            # The pure-Python scanner is stricter than libyaml's on some points
+            list(yaml.scan(buffer, Loader=yaml.BaseLoader))
+        else:
+            list(yaml.parse(buffer, Loader=yaml.BaseLoader))
+    except yaml.error.YAMLError as e:
+        return syntax_error_to_problem(e, buffer)
+
+
+def syntax_error_to_problem(e, buffer):
+    if isinstance(e, yaml.error.MarkedYAMLError):
         problem = LintProblem(e.problem_mark.line + 1,
                               e.problem_mark.column + 1,
                               'syntax error: ' + e.problem + ' (syntax)')
         problem.level = 'error'
         return problem
-    except yaml.reader.ReaderError as e:
+    elif isinstance(e, yaml.reader.ReaderError):
         # ReaderError is raised for non-printable characters (e.g. control
         # characters such as NUL) before the parser produces position marks.
         # It is a YAMLError but not a MarkedYAMLError, so derive the line and
@@ -193,51 +312,324 @@ def get_syntax_error(buffer):
                               'syntax error: ' + e.reason + ' (syntax)')
         problem.level = 'error'
         return problem
+    raise e
 
 
-def _run(buffer, conf, filepath):
-    assert hasattr(buffer, '__getitem__'), \
-        '_run() argument must be a buffer, not a stream'
-    if isinstance(buffer, bytes):
-        buffer = decoder.auto_decode(buffer)
+def _buffer_problems(buffer, conf, filepath, disabled_rules=None,
+                     context=None):
+    """Yields the cosmetic problems and the syntax error (if any) of a buffer.
 
-    first_line = next(parser.line_generator(buffer)).content
-    if re.match(r'^#\s*yamllint disable-file\s*$', first_line):
-        return
+    The syntax error is yielded as soon as it is known, before the cosmetic
+    problems found after that.
+    """
+    # The same scan of the buffer provides tokens to cosmetic rules and finds
+    # syntax errors. Since the parser always runs ahead of the tokens given to
+    # rules, a syntax error is known before any cosmetic problem located after
+    # it is found.
+    try:
+        loader = parser.SinglePassLoader(buffer)
+    except yaml.reader.ReaderError as e:
+        yield syntax_error_to_problem(e, buffer)
+        loader = None
+    syntax_error_found = loader is None
+
+    for problem in get_cosmetic_problems(buffer, conf, filepath, loader,
+                                         disabled_rules, context):
+        if not syntax_error_found and loader.syntax_error is not None:
+            yield syntax_error_to_problem(loader.syntax_error, buffer)
+            syntax_error_found = True
+        yield problem
+
+    if not syntax_error_found:
+        loader.finish_parsing()
+        if loader.syntax_error is not None:
+            yield syntax_error_to_problem(loader.syntax_error, buffer)
 
-    # If the document contains a syntax error, save it and yield it at the
-    # right line
-    syntax_error = get_syntax_error(buffer)
 
-    for problem in get_cosmetic_problems(buffer, conf, filepath):
+def _insert_syntax_error(problems):
+    """Yields cosmetic problems, with the first syntax error inserted at the
+    right place.
+
+    Syntax errors are told apart from cosmetic problems by their lack of rule.
+    """
+    syntax_error = None
+    syntax_error_reported = False
+
+    for problem in problems:
+        if problem.rule is None:
+            if syntax_error is None:
+                syntax_error = problem
+            continue
+
         # Insert the syntax error (if any) at the right place...
-        if (syntax_error and syntax_error.line <= problem.line and
+        if (not syntax_error_reported and syntax_error and
+                syntax_error.line <= problem.line and
                 syntax_error.column <= problem.column):
             yield syntax_error
 
             # Discard the problem since it is at the same place as the syntax
             # error and is probably redundant (and maybe it's just a 'warning',
             # in which case the script won't even exit with a failure status).
-            syntax_error = None
+            syntax_error_reported = True
             continue
 
         yield problem
 
-    if syntax_error:
+    if syntax_error and not syntax_error_reported:
         yield syntax_error
 
 
-def run(input, conf, filepath=None):
+def _run(buffer, conf, filepath):
+    assert hasattr(buffer, '__getitem__'), \
+        '_run() argument must be a buffer, not a stream'
+    if isinstance(buffer, bytes):
+        buffer = decoder.auto_decode(buffer)
+
+    first_line = next(parser.line_generator(buffer)).content
+    if re.match(r'^#\s*yamllint disable-file\s*$', first_line):
+        return
+
+    yield from _insert_syntax_error(_buffer_problems(buffer, conf, filepath))
+
+
+def _read_lines(stream, size=64 * 1024):
+    """Yields the lines of a stream, with their new line character.
+
+    Binary streams are decoded the same way as whole files are.
+    """
+    text_decoder = None
+    head = b''
+    rest = ''
+    while True:
+        data = stream.read(size)
+        if isinstance(data, bytes):
+            if text_decoder is None:
+                # The first bytes are needed to detect the encoding
+                head += data
+                if data and len(head) < 4:
+                    continue
+                text_decoder = codecs.getincrementaldecoder(
+                    decoder.detect_encoding(head))()
+                data = head
+            text = text_decoder.decode(data, final=not data)
+        else:
+            text = data
+
+        lines = (rest + text).split('\n')
+        rest = lines.pop()
+        for line in lines:
+            yield line + '\n'
+
+        if not data:
+            break
+    if rest:
+        yield rest
+
+
+def _is_marker_line(line, marker):
+    return line.startswith(marker) and line[3:4] in ('', ' ', '\t', '\r', '\n')
+
+
+def _is_comment_or_blank_line(line):
+    return line.lstrip(' \t')[:1] in ('', '#', '\r', '\n')
+
+
+def _split_documents(lines):
+    """Splits lines of a YAML stream into chunks holding one document each.
+
+    A chunk starts on a document start marker (``---`` at the beginning of a
+    line), on the directives preceding it, or after a document end marker
+    (``...``). Whatever precedes the first document start marker with content
+    goes into the first chunk.
+    """
+    chunk = []
+    directives = []
+    has_content = False
+    ended = False
+    for line in lines:
+        if has_content and _is_marker_line(line, '---'):
+            yield chunk
+            chunk = []
+        elif ended:
+            ended = False
+            yield chunk
+            chunk = []
+
+        if _is_marker_line(line, '---'):
+            chunk.extend(directives)
+            chunk.append(line)
+            directives = []
+            has_content = True
+        elif line.startswith('%') or (
+                directives and _is_comment_or_blank_line(line)):
+            directives.append(line)
+        else:
+            chunk.extend(directives)
+            chunk.append(line)
+            has_content = (has_content or bool(directives) or
+                           not _is_comment_or_blank_line(line))
+            directives = []
+            if has_content and _is_marker_line(line, '...'):
+                # Following lines (comments, directives, next document) are
+                # not part of this document anymore
+                ended = True
+                has_content = False
+    chunk.extend(directives)
+    yield chunk
+
+
+def _is_end_of_stream_problem(problem, first, chunk):
+    # document-end reports a missing "..." at the end of the stream on the
+    # line before, when the stream does not end with a new line character.
+    return (problem.rule == 'document-end' and problem.line == first and
+            len(chunk) == 1 and not chunk[0].endswith('\n'))
+
+
+_LINE_BREAKS_RE = re.compile('\r\n|[\r\n\x85\u2028\u2029]')
+
+
+def _count_breaks(lines):
+    """Counts line breaks the way PyYAML does, for positions of tokens."""
+    text = ''.join(lines)
+    if text.isascii() and '\r' not in text:
+        return text.count('\n')
+    return len(_LINE_BREAKS_RE.findall(text))
+
+
+def _continued_scalar(buffer, line):
+    """Returns the scalar token continued by a line of a buffer starting with
+    "%", or None if this line is a directive."""
+    prev = None
+    try:
+        for token in yaml.scan(buffer, Loader=yaml.BaseLoader):
+            if token.start_mark.line < line:
+                prev = token
+            elif isinstance(token, yaml.DirectiveToken):
+                if token.start_mark.line == line:
+                    return None
+                break
+            elif not isinstance(token, yaml.BlockEndToken):
+                break
+    except yaml.error.YAMLError:
+        return None
+    return prev if isinstance(prev, yaml.ScalarToken) else None
+
+
+def _run_per_document(stream, conf, filepath):
+    chunks = _split_documents(_read_lines(stream))
+    chunk = next(chunks)
+    if chunk and re.match(r'^#\s*yamllint disable-file\s*$',
+                          chunk[0].rstrip('\n')):
+        return
+
+    # Line rules count lines separated by "\n", while positions of tokens
+    # (and syntax errors) count all line breaks known to PyYAML.
+    line_rules = {rule.ID for rule in conf.enabled_rules(filepath)
+                  if rule.TYPE == 'line'}
+
+    # Each chunk is linted in a buffer of its own, surrounded by a few lines
+    # so that rules see the same context as in the whole stream:
+    # - before: lines standing for the end of the previous document (a
+    #   scalar, a mapping, or a scalar and the "..." marker), followed by the
+    #   last line of the previous chunk if it is a comment (it may hold
+    #   "disable-line"),
+    # - after: the beginning of the next chunk, up to its "---" marker,
+    #   without "# yamllint" directives.
+    # Problems found on these lines are reported by the other chunks.
+    # Rules also keep their contexts from one chunk to the next, for what they
+    # learn from the whole stream (e.g. indentation with "spaces: consistent").
+    prefix = []
+    line_no = token_line_no = 1
+    disabled_rules = set()
+    context = {}
+    while chunk is not None:
+        next_chunk = next(chunks, None)
+        suffix = []
+        if next_chunk is not None:
+            for line in next_chunk:
+                if _is_marker_line(line, '---'):
+                    suffix.append('---\n')
+                    break
+                # Directives in comments apply from the next chunk on
+                if '# yamllint' in line:
+                    line = line[:line.index('# yamllint')] + '\n'
+                suffix.append(line)
+
+        buffer = ''.join(prefix + chunk + suffix)
+        # Lines of the chunk in the buffer: (first, last], in both countings
+        bounds = (len(prefix), len(prefix) + len(chunk))
+        token_bounds = (_count_breaks(prefix),
+                        _count_breaks(prefix) + _count_breaks(chunk))
+        syntax_error = False
+        for problem in _buffer_problems(buffer, conf, filepath,
+                                        disabled_rules, context):
+            syntax_error = syntax_error or problem.rule is None
+            first, last = (bounds if problem.rule in line_rules
+                           else token_bounds)
+            # Syntax errors in the following lines are not found again by the
+            # next chunk, which starts anew
+            if ((prefix and problem.line <= first and
+                    not _is_end_of_stream_problem(problem, first, chunk)) or
+                    (next_chunk is not None and problem.line > last and
+                     problem.rule is not None)):
+                continue
+            problem.line += ((line_no if problem.rule in line_rules
+                              else token_line_no) - first - 1)
+            yield problem
+        if syntax_error:
+            # Rules stopped in the middle of the chunk, don't carry that over
+            context = {}
+
+        end_marker = False
+        for line in chunk:
+            if _is_marker_line(line, '...'):
+                end_marker = True
+            elif not _is_comment_or_blank_line(line):
+                end_marker = False
+        if end_marker:
+            prefix = ['x\n', '...\n']
+        elif not (suffix[:1] and suffix[0].startswith('%')):
+            prefix = ['x\n']
+        else:
+            # Without "..." before them, "%" lines can either be directives
+            # or continue a scalar of the previous document
+            scalar = _continued_scalar(buffer, token_bounds[1])
+            if scalar is None:
+                prefix = ['x: x\n']
+            else:
+                prefix = [' ' * scalar.start_mark.column + 'x\n']
+        if chunk and chunk[-1].lstrip(' \t').startswith('#'):
+            prefix.append(chunk[-1])
+
+        line_no += len(chunk)
+        token_line_no += _count_breaks(chunk)
+        chunk = next_chunk
+
+
+def run(input, conf, filepath=None, per_document=False):
     """Lints a YAML source.
 
     Returns a generator of LintProblem objects.
 
     :param input: buffer, string or stream to read from
     :param conf: yamllint configuration object
+    :param per_document: lint documents of the stream one after the other, so
+                         that memory use is bounded by the size of the largest
+                         document instead of the whole stream
     """
     if filepath is not None and conf.is_file_ignored(filepath):
         return ()
 
+    if per_document:
+        if isinstance(input, str):
+            input = io.StringIO(input)
+        elif isinstance(input, bytes):
+            input = io.BytesIO(input)
+        elif not isinstance(input, io.IOBase):
+            raise TypeError('input should be a string or a stream')
+        return _insert_syntax_error(
+            _run_per_document(input, conf, filepath))
+
     if isinstance(input, (bytes, str)):
         return _run(input, conf, filepath)
     elif isinstance(input, io.IOBase):
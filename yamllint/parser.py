@@ -13,15 +13,75 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+import re
+
 import yaml
 
+try:
+    from yaml import CBaseLoader
+except ImportError:  # PyYAML built without libyaml
+    CBaseLoader = None
+
+
+_NEWLINE_RE = re.compile('\n')
+_HASH_RE = re.compile('#')
+
+
+def _offsets_array(buffer):
+    return array('I' if len(buffer) < 2 ** 32 else 'Q')
+
+
+def line_starts(buffer):
+    """Returns the offsets where the lines of a buffer start.
+
+    Lines are separated by '\n' (so the first line starts at 0, and there is
+    always one more line than '\n' characters).
+    """
+    starts = _offsets_array(buffer)
+    starts.append(0)
+    starts.extend(m.end() for m in _NEWLINE_RE.finditer(buffer))
+    return starts
+
+
+def hash_signs(buffer):
+    """Returns the offsets of all '#' characters in a buffer.
+
+    Comments start at some of them (others are inside scalars).
+    """
+    signs = _offsets_array(buffer)
+    signs.extend(m.start() for m in _HASH_RE.finditer(buffer))
+    return signs
+
+
+def line_index(line_starts, pointer):
+    """Returns the index of the line holding a position in the buffer."""
+    return bisect_right(line_starts, pointer) - 1
+
+
+def line_index_of_mark(line_starts, mark):
+    """Returns the index of the line holding a PyYAML mark.
+
+    It is the line number of the mark, unless PyYAML counted other line breaks
+    than '\n' before it (then the index is searched).
+    """
+    if (mark.line < len(line_starts) and
+            line_starts[mark.line] == mark.pointer - mark.column):
+        return mark.line
+    return line_index(line_starts, mark.pointer)
+
 
 class Line:
-    def __init__(self, line_no, buffer, start, end):
+    __slots__ = ('buffer', 'end', 'line_no', 'line_starts', 'start')
+
+    def __init__(self, line_no, buffer, start, end, line_starts=None):
         self.line_no = line_no
         self.start = start
         self.end = end
         self.buffer = buffer
+        self.line_starts = line_starts
 
     @property
     def content(self):
@@ -29,17 +89,24 @@ class Line:
 
 
 class Token:
-    def __init__(self, line_no, curr, prev, next, nextnext):
+    __slots__ = ('curr', 'line_no', 'line_starts', 'next', 'nextnext', 'prev')
+
+    def __init__(self, line_no, curr, prev, next, nextnext, line_starts=None):
         self.line_no = line_no
         self.curr = curr
         self.prev = prev
         self.next = next
         self.nextnext = nextnext
+        self.line_starts = line_starts
 
 
 class Comment:
+    __slots__ = ('_text', 'buffer', 'column_no', 'comment_before', 'line_no',
+                 'line_starts', 'pointer', 'token_after', 'token_before')
+
     def __init__(self, line_no, column_no, buffer, pointer,
-                 token_before=None, token_after=None, comment_before=None):
+                 token_before=None, token_after=None, comment_before=None,
+                 line_starts=None):
         self.line_no = line_no
         self.column_no = column_no
         self.buffer = buffer
@@ -47,14 +114,19 @@ class Comment:
         self.token_before = token_before
         self.token_after = token_after
         self.comment_before = comment_before
+        self.line_starts = line_starts
+        self._text = None
 
     def __str__(self):
-        end = self.buffer.find('\n', self.pointer)
-        if end == -1:
-            end = self.buffer.find('\0', self.pointer)
-        if end != -1:
-            return self.buffer[self.pointer:end]
-        return self.buffer[self.pointer:]
+        if self._text is None:
+            end = self.buffer.find('\n', self.pointer)
+            if end == -1:
+                end = self.buffer.find('\0', self.pointer)
+            if end != -1:
+                self._text = self.buffer[self.pointer:end]
+            else:
+                self._text = self.buffer[self.pointer:]
+        return self._text
 
     def __eq__(self, other):
         return (isinstance(other, Comment) and
@@ -71,85 +143,272 @@ class Comment:
         )
 
 
-def line_generator(buffer):
-    line_no = 1
-    cur = 0
-    next = buffer.find('\n')
-    while next != -1:
-        if next > 0 and buffer[next - 1] == '\r':
-            yield Line(line_no, buffer, start=cur, end=next - 1)
-        else:
-            yield Line(line_no, buffer, start=cur, end=next)
-        cur = next + 1
-        next = buffer.find('\n', cur)
-        line_no += 1
+MAP, SEQ = range(2)
+
+# Tokens opening a collection, with its type and whether it is a flow one
+_OPENINGS = {
+    yaml.BlockMappingStartToken: (MAP, False),
+    yaml.FlowMappingStartToken: (MAP, True),
+    yaml.BlockSequenceStartToken: (SEQ, False),
+    yaml.FlowSequenceStartToken: (SEQ, True),
+}
+# Tokens closing a collection, with whether it is a flow one
+_CLOSINGS = {
+    yaml.BlockEndToken: False,
+    yaml.FlowMappingEndToken: True,
+    yaml.FlowSequenceEndToken: True,
+}
+
+
+class Collection:
+    """A mapping or a sequence, opened by a token and not closed yet."""
+    __slots__ = ('data', 'flow', 'type')
+
+    def __init__(self, type, flow):
+        self.type = type
+        self.flow = flow
+        #: Data that rules keep about this collection, by rule ID
+        self.data = {}
 
-    yield Line(line_no, buffer, start=cur, end=len(buffer))
 
+class Structure:
+    """Nesting of mappings and sequences around the current token.
 
-def comments_between_tokens(token1, token2):
+    The linter updates it once per token, before calling token rules, which
+    find it in ``context['structure']``.
+    """
+    def __init__(self):
+        #: Collections the current token is in, the innermost last
+        self.stack = []
+        #: Number of flow collections the current token is in (this can be
+        #: negative after unbalanced closing brackets or braces)
+        self.flow_level = 0
+
+    @property
+    def current(self):
+        """The innermost collection, or None."""
+        return self.stack[-1] if self.stack else None
+
+    def update(self, token):
+        token_type = type(token)
+        if token_type in _OPENINGS:
+            collection_type, flow = _OPENINGS[token_type]
+            self.stack.append(Collection(collection_type, flow))
+            if flow:
+                self.flow_level += 1
+        elif token_type in _CLOSINGS:
+            if self.stack:
+                self.stack.pop()
+            if _CLOSINGS[token_type]:
+                self.flow_level -= 1
+
+
+def get_line(buffer, line_starts, index):
+    """Returns the line at an index (starting at 0) of a buffer."""
+    start = line_starts[index]
+    if index + 1 == len(line_starts):
+        return Line(index + 1, buffer, start, len(buffer), line_starts)
+    end = line_starts[index + 1] - 1
+    if end > 0 and buffer[end - 1] == '\r':
+        end -= 1
+    return Line(index + 1, buffer, start, end, line_starts)
+
+
+def line_generator(buffer, starts=None):
+    if starts is None:
+        starts = line_starts(buffer)
+    for i in range(len(starts)):
+        yield get_line(buffer, starts, i)
+
+
+def comments_between_tokens(token1, token2, line_starts=None):
     """Find all comments between two tokens"""
+    buffer = token1.end_mark.buffer
+    pointer = token1.end_mark.pointer
     if token2 is None:
-        buf = token1.end_mark.buffer[token1.end_mark.pointer:]
+        end = len(buffer)
     elif (token1.end_mark.line == token2.start_mark.line and
           not isinstance(token1, yaml.StreamStartToken) and
           not isinstance(token2, yaml.StreamEndToken)):
         return
     else:
-        buf = token1.end_mark.buffer[token1.end_mark.pointer:
-                                     token2.start_mark.pointer]
+        end = token2.start_mark.pointer
 
     line_no = token1.end_mark.line + 1
-    column_no = token1.end_mark.column + 1
-    pointer = token1.end_mark.pointer
+    line_start = pointer - token1.end_mark.column
 
     comment_before = None
-    for line in buf.split('\n'):
-        pos = line.find('#')
-        if pos != -1:
-            comment = Comment(line_no, column_no + pos,
-                              token1.end_mark.buffer, pointer + pos,
-                              token1, token2, comment_before)
-            yield comment
+    pos = buffer.find('#', pointer, end)
+    while pos != -1:
+        newlines = buffer.count('\n', pointer, pos)
+        if newlines:
+            line_no += newlines
+            line_start = buffer.rfind('\n', pointer, pos) + 1
+        comment = Comment(line_no, pos - line_start + 1, buffer, pos,
+                          token1, token2, comment_before, line_starts)
+        yield comment
 
-            comment_before = comment
+        comment_before = comment
 
-        pointer += len(line) + 1
-        line_no += 1
-        column_no = 1
+        # Only the first '#' of a line starts a comment
+        pointer = buffer.find('\n', pos, end)
+        if pointer == -1:
+            break
+        pos = buffer.find('#', pointer, end)
 
 
-def token_or_comment_generator(buffer):
-    try:
-        yaml_loader = yaml.BaseLoader(buffer)
-    except yaml.reader.ReaderError:
-        # Failures like ReaderError on non-printable characters are surfaced
-        # separately as a syntax error by the linter, so ignore them here.
-        return
+def is_valid_for_libyaml(buffer):
+    """Tells whether libyaml (when available) parses a buffer without error.
 
+    libyaml is much faster than the pure-Python parser, so it is used to skip
+    the latter on valid buffers (the pure-Python scanner, which is stricter on
+    a few points, still runs). Syntax errors are still reported by PyYAML, so
+    that their positions and messages don't depend on libyaml. As libyaml
+    accepts a few flow collections that PyYAML rejects, buffers that may hold
+    flow collections are not checked.
+    """
+    if CBaseLoader is None or '[' in buffer or '{' in buffer:
+        return False
+    loader = CBaseLoader(buffer)
     try:
-        prev = None
-        curr = yaml_loader.get_token()
-        while curr is not None:
-            next = yaml_loader.get_token()
-            nextnext = (yaml_loader.peek_token()
-                        if yaml_loader.check_token() else None)
+        loader.raw_parse()
+    except yaml.error.YAMLError:
+        return False
+    finally:
+        loader.dispose()
+    return True
+
+
+class SinglePassLoader(yaml.reader.Reader, yaml.scanner.Scanner,
+                       yaml.parser.Parser):
+    """PyYAML loader that gives access to the tokens consumed by its parser.
+
+    Driving the parser and recording the tokens it pulls from the scanner
+    allows getting both the tokens (for cosmetic rules) and the syntax error
+    (if any) out of a single scan of the buffer.
+    """
+    def __init__(self, buffer):
+        yaml.reader.Reader.__init__(self, buffer)
+        yaml.scanner.Scanner.__init__(self)
+        yaml.parser.Parser.__init__(self)
+        #: First error raised by the parser (or the scanner), if any
+        self.syntax_error = None
+        # When the buffer is known to be valid, only the scanner is needed
+        self.parsing = not is_valid_for_libyaml(buffer)
+        self.consumed_tokens = deque()
+
+    def get_token(self):
+        token = super().get_token()
+        if token is not None:
+            self.consumed_tokens.append(token)
+        return token
+
+    def pull_token(self):
+        """Makes one more token available in ``consumed_tokens``.
+
+        Returns False when there are no more tokens. Raises ScannerError when
+        the scanner cannot go further.
+        """
+        count = len(self.consumed_tokens)
+        try:
+            while self.parsing and len(self.consumed_tokens) == count:
+                if self.get_event() is None:
+                    self.parsing = False
+        except yaml.error.MarkedYAMLError as e:
+            self.syntax_error = e
+            self.parsing = False
+            if isinstance(e, yaml.scanner.ScannerError):
+                raise
+        # After a parser error (or once parsing is done), keep on scanning
+        # tokens so that cosmetic rules still apply to the rest of the buffer.
+        try:
+            if len(self.consumed_tokens) == count and self.check_token():
+                self.get_token()
+        except yaml.scanner.ScannerError as e:
+            if self.syntax_error is None:
+                self.syntax_error = e
+            raise
+        return len(self.consumed_tokens) > count
+
+    def finish_parsing(self):
+        """Parses the rest of the buffer, to find the syntax error (if any).
+
+        Tokens consumed from now on are discarded, so this should only be
+        called once ``consumed_tokens`` is not used anymore.
+        """
+        try:
+            while self.parsing:
+                if self.get_event() is None:
+                    self.parsing = False
+                self.consumed_tokens.clear()
+            # When only scanning, the scanner can still fail further
+            while self.syntax_error is None and self.check_token():
+                self.get_token()
+                self.consumed_tokens.clear()
+        except yaml.error.MarkedYAMLError as e:
+            self.syntax_error = e
+            self.parsing = False
+
+
+def token_or_comment_generator(buffer, loader=None, starts=None):
+    if loader is None:
+        try:
+            loader = SinglePassLoader(buffer)
+        except yaml.reader.ReaderError:
+            # Failures like ReaderError on non-printable characters are
+            # surfaced separately as a syntax error by the linter, so ignore
+            # them here.
+            return
+
+    # '#' offsets in the buffer of the loader, which token marks refer to. It
+    # is the buffer followed by '\0', so it has the same line starts.
+    signs = hash_signs(loader.buffer)
+    if starts is None:
+        starts = line_starts(buffer)
+    k = 0
+    tokens = loader.consumed_tokens
+    scanner_failed = False
+    prev = None
+    while True:
+        # Make sure the current token and the two next ones are known
+        try:
+            while (not scanner_failed and len(tokens) < 3 and
+                   loader.pull_token()):
+                pass
+        except yaml.scanner.ScannerError:
+            scanner_failed = True
+
+        # When the scanner fails, only tokens whose two followers could be
+        # scanned are reported.
+        if not tokens or (scanner_failed and len(tokens) < 3):
+            break
 
-            yield Token(curr.start_mark.line + 1, curr, prev, next, nextnext)
+        curr = tokens.popleft()
+        next = tokens[0] if len(tokens) > 0 else None
+        nextnext = tokens[1] if len(tokens) > 1 else None
 
-            yield from comments_between_tokens(curr, next)
+        yield Token(curr.start_mark.line + 1, curr, prev, next, nextnext,
+                    starts)
 
-            prev = curr
-            curr = next
+        # Most gaps between tokens hold no comments. signs[k] is the first
+        # '#' after some previous token: if it is not before the next token,
+        # there is no '#' in this gap.
+        if k < len(signs) and (next is None or
+                               signs[k] < next.start_mark.pointer):
+            k = bisect_left(signs, curr.end_mark.pointer)
+            if k < len(signs) and (next is None or
+                                   signs[k] < next.start_mark.pointer):
+                yield from comments_between_tokens(curr, next, starts)
 
-    except yaml.scanner.ScannerError:
-        pass
+        prev = curr
 
 
-def token_or_comment_or_line_generator(buffer):
+def token_or_comment_or_line_generator(buffer, loader=None, starts=None):
     """Generator that mixes tokens and lines, ordering them by line number"""
-    tok_or_com_gen = token_or_comment_generator(buffer)
-    line_gen = line_generator(buffer)
+    if starts is None:
+        starts = line_starts(buffer)
+    tok_or_com_gen = token_or_comment_generator(buffer, loader, starts)
+    line_gen = line_generator(buffer, starts)
 
     tok_or_com = next(tok_or_com_gen, None)
     line = next(line_gen, None)
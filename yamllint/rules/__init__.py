@@ -13,61 +13,43 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from yamllint.rules import (
-    anchors,
-    braces,
-    brackets,
-    colons,
-    commas,
-    comments,
-    comments_indentation,
-    document_end,
-    document_start,
-    empty_lines,
-    empty_values,
-    float_values,
-    hyphens,
-    indentation,
-    key_duplicates,
-    key_ordering,
-    line_length,
-    new_line_at_end_of_file,
-    new_lines,
-    octal_values,
-    quoted_strings,
-    trailing_spaces,
-    truthy,
-)
+import importlib
 
+# Modules of the rules, by rule ID. They are only imported when a rule is
+# first used, so that disabled rules cost nothing.
 _RULES = {
-    anchors.ID: anchors,
-    braces.ID: braces,
-    brackets.ID: brackets,
-    colons.ID: colons,
-    commas.ID: commas,
-    comments.ID: comments,
-    comments_indentation.ID: comments_indentation,
-    document_end.ID: document_end,
-    document_start.ID: document_start,
-    empty_lines.ID: empty_lines,
-    empty_values.ID: empty_values,
-    float_values.ID: float_values,
-    hyphens.ID: hyphens,
-    indentation.ID: indentation,
-    key_duplicates.ID: key_duplicates,
-    key_ordering.ID: key_ordering,
-    line_length.ID: line_length,
-    new_line_at_end_of_file.ID: new_line_at_end_of_file,
-    new_lines.ID: new_lines,
-    octal_values.ID: octal_values,
-    quoted_strings.ID: quoted_strings,
-    trailing_spaces.ID: trailing_spaces,
-    truthy.ID: truthy,
+    'anchors': 'anchors',
+    'braces': 'braces',
+    'brackets': 'brackets',
+    'colons': 'colons',
+    'commas': 'commas',
+    'comments': 'comments',
+    'comments-indentation': 'comments_indentation',
+    'document-end': 'document_end',
+    'document-start': 'document_start',
+    'empty-lines': 'empty_lines',
+    'empty-values': 'empty_values',
+    'float-values': 'float_values',
+    'hyphens': 'hyphens',
+    'indentation': 'indentation',
+    'key-duplicates': 'key_duplicates',
+    'key-ordering': 'key_ordering',
+    'line-length': 'line_length',
+    'new-line-at-end-of-file': 'new_line_at_end_of_file',
+    'new-lines': 'new_lines',
+    'octal-values': 'octal_values',
+    'quoted-strings': 'quoted_strings',
+    'trailing-spaces': 'trailing_spaces',
+    'truthy': 'truthy',
 }
 
 
+def exists(id):
+    return id in _RULES
+
+
 def get(id):
     if id not in _RULES:
         raise ValueError(f'no such rule: "{id}"')
 
-    return _RULES[id]
+    return importlib.import_module(f'yamllint.rules.{_RULES[id]}')
@@ -139,6 +139,7 @@ from yamllint.rules.common import spaces_after, spaces_before
 
 ID = 'braces'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.FlowMappingStartToken, yaml.FlowMappingEndToken)
 CONF = {'forbid': (bool, 'non-empty'),
         'min-spaces-inside': int,
         'max-spaces-inside': int,
@@ -140,6 +140,7 @@ from yamllint.rules.common import spaces_after, spaces_before
 
 ID = 'brackets'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.FlowSequenceStartToken, yaml.FlowSequenceEndToken)
 CONF = {'forbid': (bool, 'non-empty'),
         'min-spaces-inside': int,
         'max-spaces-inside': int,
@@ -84,6 +84,7 @@ from yamllint.rules.common import is_explicit_key, spaces_after, spaces_before
 
 ID = 'colons'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.KeyToken, yaml.ValueToken)
 CONF = {'max-spaces-before': int,
         'max-spaces-after': int}
 DEFAULT = {'max-spaces-before': 0,
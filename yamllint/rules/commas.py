@@ -108,6 +108,7 @@ from yamllint.rules.common import spaces_after, spaces_before
 
 ID = 'commas'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.FlowEntryToken, )
 CONF = {'max-spaces-before': int,
         'min-spaces-after': int,
         'max-spaces-after': int}
@@ -109,7 +109,8 @@ def check(conf, comment):
     if isinstance(comment.token_before, yaml.StreamStartToken):
         prev_line_indent = 0
     else:
-        prev_line_indent = get_line_indent(comment.token_before)
+        prev_line_indent = get_line_indent(comment.token_before,
+                                           comment.line_starts)
 
     # In the following case only the next line indent is valid:
     #     list:
@@ -13,11 +13,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import re
 import string
 
 import yaml
 
 from yamllint.linter import LintProblem
+from yamllint.parser import line_index_of_mark
 
 
 def spaces_after(token, prev, next, min=-1, max=-1,
@@ -47,10 +49,17 @@ def spaces_before(token, prev, next, min=-1, max=-1,
                                token.start_mark.column + 1, min_desc)
 
 
-def get_line_indent(token):
-    """Finds the indent of the line the token starts in."""
-    start = token.start_mark.buffer.rfind('\n', 0,
-                                          token.start_mark.pointer) + 1
+def get_line_indent(token, line_starts=None):
+    """Finds the indent of the line the token starts in.
+
+    With the line starts of the buffer, the line is found without searching
+    back for the previous new line.
+    """
+    if line_starts is None:
+        start = token.start_mark.buffer.rfind('\n', 0,
+                                              token.start_mark.pointer) + 1
+    else:
+        start = line_starts[line_index_of_mark(line_starts, token.start_mark)]
     content = start
     while token.start_mark.buffer[content] == ' ':
         content += 1
@@ -86,3 +95,123 @@ def is_explicit_key(token):
     #   : v
     return (token.start_mark.pointer < token.end_mark.pointer and
             token.start_mark.buffer[token.start_mark.pointer] == '?')
+
+
+# Matches all numbers that the float-values rule is interested in, telling
+# what kind of number it is with named groups
+FLOAT_PATTERN = re.compile(
+    r'(?P<nan>\.nan|\.NaN|\.NAN)$'
+    r'|[-+]?(?:(?P<inf>\.inf|\.Inf|\.INF)$'
+    r'|(?:(?P<fraction>\.[0-9]+)|[0-9]+(?:\.[0-9]*)?)'
+    r'(?P<exponent>[eE][-+]?[0-9]+)?$)')
+IS_OCTAL_NUMBER_PATTERN = re.compile(r'^[0-7]+$')
+
+
+class _Resolver(yaml.resolver.Resolver):
+    pass
+
+
+# Also resolve YAML 1.2 octal numbers (e.g. 0o14) as integers. This is done on
+# a subclass, so that the resolver of PyYAML is left untouched.
+# https://stackoverflow.com/a/36514274
+_Resolver.add_implicit_resolver(
+    'tag:yaml.org,2002:int',
+    re.compile(r'''^(?:[-+]?0b[0-1_]+
+               |[-+]?0o?[0-7_]+
+               |[-+]?0[0-7_]+
+               |[-+]?(?:0|[1-9][0-9_]*)
+               |[-+]?0x[0-9a-fA-F_]+
+               |[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+)$''', re.VERBOSE),
+    list('-+0123456789'))
+
+_resolver = _Resolver()
+
+
+class ScalarClass:
+    """What the value of a scalar token would be if it was a plain scalar.
+
+    It is computed by classify_scalar(), and shared by all the rules that look
+    at the value of scalars. Resolving the tag is the costliest part, so it is
+    only done the first time a rule asks for it.
+    """
+    __slots__ = ('_tag', 'explicit_octal', 'implicit_octal', 'inf', 'nan',
+                 'numeral_before_decimal_missing', 'scientific_notation',
+                 'value')
+
+    def __init__(self, value):
+        self.value = value
+        self._tag = None
+
+        m = FLOAT_PATTERN.match(value)
+        if m is None:
+            self.nan = self.inf = self.scientific_notation = False
+            self.numeral_before_decimal_missing = False
+        else:
+            self.nan = m.group('nan') is not None
+            self.inf = m.group('inf') is not None
+            self.scientific_notation = m.group('exponent') is not None
+            self.numeral_before_decimal_missing = \
+                m.group('fraction') is not None
+
+        self.implicit_octal = (
+            len(value) > 1 and value[0] == '0' and value.isdigit() and
+            IS_OCTAL_NUMBER_PATTERN.match(value[1:]) is not None)
+        self.explicit_octal = (
+            len(value) > 2 and value[:2] == '0o' and
+            IS_OCTAL_NUMBER_PATTERN.match(value[2:]) is not None)
+
+    @property
+    def tag(self):
+        if self._tag is None:
+            self._tag = _resolver.resolve(yaml.nodes.ScalarNode, self.value,
+                                          (True, False))
+        return self._tag
+
+
+_scalar_classes = {}
+
+
+def classify_scalar(token):
+    """Classifies the value of a scalar token.
+
+    The same values come up again and again (in the same file and in other
+    files), so classes of short values are kept and reused.
+    """
+    try:
+        return _scalar_classes[token.value]
+    except KeyError:
+        scalar_class = ScalarClass(token.value)
+        if len(token.value) <= 64:
+            if len(_scalar_classes) >= 4096:
+                _scalar_classes.clear()
+            _scalar_classes[token.value] = scalar_class
+        return scalar_class
+
+
+# Named groups (that can't appear twice in a pattern) and references to
+# groups by number or name, that would be broken by joining patterns together
+_UNJOINABLE_PATTERN = re.compile(r'\\[1-9]|\(\?P[<=]|\(\?\(')
+
+
+class PatternList(list):
+    """List of regular expressions given in a rule option.
+
+    They are also compiled into a single alternation, so that searching a
+    string for any of them is only one search() call. (Patterns with inline
+    flags, named groups or group references are kept apart, as joining them
+    would change their meaning or make an invalid pattern.)
+    """
+    def __init__(self, patterns):
+        super().__init__(patterns)
+        compiled = [re.compile(pattern) for pattern in self]
+        joinable = [pattern for pattern in compiled
+                    if pattern.flags == re.UNICODE and
+                    not _UNJOINABLE_PATTERN.search(pattern.pattern)]
+        self._compiled = [pattern for pattern in compiled
+                          if pattern not in joinable]
+        if joinable:
+            self._compiled.insert(0, re.compile('|'.join(
+                f'(?:{pattern.pattern})' for pattern in joinable)))
+
+    def search(self, string):
+        return any(pattern.search(string) for pattern in self._compiled)
@@ -87,6 +87,8 @@ from yamllint.linter import LintProblem
 
 ID = 'document-end'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.DocumentStartToken, yaml.DocumentEndToken,
+               yaml.StreamEndToken)
 CONF = {'present': bool}
 DEFAULT = {'present': True}
 
@@ -59,7 +59,10 @@ Use this rule to set a maximal number of allowed consecutive blank lines.
 """
 
 
+import re
+
 from yamllint.linter import LintProblem
+from yamllint.parser import get_line, line_index
 
 ID = 'empty-lines'
 TYPE = 'line'
@@ -70,6 +73,8 @@ DEFAULT = {'max': 2,
            'max-start': 0,
            'max-end': 0}
 
+BLANK_LINE_PATTERN = re.compile(r'^(?=\r?\n)', re.MULTILINE)
+
 
 def check(conf, line):
     if line.start == line.end and line.end < len(line.buffer):
@@ -114,3 +119,10 @@ def check(conf, line):
         if blank_lines > max:
             yield LintProblem(line.line_no, 1,
                               f'too many blank lines ({blank_lines} > {max})')
+
+
+def check_buffer(conf, buffer, starts):
+    # Only blank lines are checked
+    for match in BLANK_LINE_PATTERN.finditer(buffer):
+        yield from check(conf, get_line(buffer, starts,
+                                        line_index(starts, match.start())))
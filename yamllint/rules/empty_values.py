@@ -107,6 +107,7 @@ from yamllint.linter import LintProblem
 
 ID = 'empty-values'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.ValueToken, yaml.BlockEntryToken)
 CONF = {'forbid-in-block-mappings': bool,
         'forbid-in-flow-mappings': bool,
         'forbid-in-block-sequences': bool}
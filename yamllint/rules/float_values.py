@@ -84,14 +84,14 @@ positive and negative infinity and "not a number".
       angle: .inf
 """
 
-import re
-
 import yaml
 
 from yamllint.linter import LintProblem
+from yamllint.rules.common import classify_scalar
 
 ID = 'float-values'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.ScalarToken, )
 CONF = {
     'require-numeral-before-decimal': bool,
     'forbid-scientific-notation': bool,
@@ -105,15 +105,6 @@ DEFAULT = {
     'forbid-inf': False,
 }
 
-IS_NUMERAL_BEFORE_DECIMAL_PATTERN = (
-    re.compile(r'[-+]?(\.[0-9]+)([eE][-+]?[0-9]+)?$')
-)
-IS_SCIENTIFIC_NOTATION_PATTERN = re.compile(
-    r'[-+]?(\.[0-9]+|[0-9]+(\.[0-9]*)?)([eE][-+]?[0-9]+)$'
-)
-IS_INF_PATTERN = re.compile(r'[-+]?(\.inf|\.Inf|\.INF)$')
-IS_NAN_PATTERN = re.compile(r'(\.nan|\.NaN|\.NAN)$')
-
 
 def check(conf, token, prev, next, nextnext, context):
     if prev and isinstance(prev, yaml.tokens.TagToken):
@@ -122,34 +113,31 @@ def check(conf, token, prev, next, nextnext, context):
         return
     if token.style:
         return
-    val = token.value
+    scalar = classify_scalar(token)
 
-    if conf['forbid-nan'] and IS_NAN_PATTERN.match(val):
+    if conf['forbid-nan'] and scalar.nan:
         yield LintProblem(
             token.start_mark.line + 1,
             token.start_mark.column + 1,
             f'forbidden not a number value "{token.value}"',
         )
 
-    if conf['forbid-inf'] and IS_INF_PATTERN.match(val):
+    if conf['forbid-inf'] and scalar.inf:
         yield LintProblem(
             token.start_mark.line + 1,
             token.start_mark.column + 1,
             f'forbidden infinite value "{token.value}"',
         )
 
-    if conf[
-        'forbid-scientific-notation'
-    ] and IS_SCIENTIFIC_NOTATION_PATTERN.match(val):
+    if conf['forbid-scientific-notation'] and scalar.scientific_notation:
         yield LintProblem(
             token.start_mark.line + 1,
             token.start_mark.column + 1,
             f'forbidden scientific notation "{token.value}"',
         )
 
-    if conf[
-        'require-numeral-before-decimal'
-    ] and IS_NUMERAL_BEFORE_DECIMAL_PATTERN.match(val):
+    if (conf['require-numeral-before-decimal'] and
+            scalar.numeral_before_decimal_missing):
         yield LintProblem(
             token.start_mark.line + 1,
             token.start_mark.column + 1,
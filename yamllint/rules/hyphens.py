@@ -81,6 +81,7 @@ from yamllint.rules.common import spaces_after
 
 ID = 'hyphens'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.BlockEntryToken, )
 CONF = {'max-spaces-after': int}
 DEFAULT = {'max-spaces-after': 1}
 
@@ -202,6 +202,7 @@ Use this rule to control the indentation.
 import yaml
 
 from yamllint.linter import LintProblem
+from yamllint.parser import line_index, line_index_of_mark
 from yamllint.rules.common import get_real_end_line, is_explicit_key
 
 ID = 'indentation'
@@ -283,12 +284,11 @@ def check_scalar_indentation(conf, token, context):
 
     line_no = token.start_mark.line + 1
 
-    line_start = token.start_mark.pointer
-    while True:
-        line_start = token.start_mark.buffer.find(
-            '\n', line_start, token.end_mark.pointer - 1) + 1
-        if line_start == 0:
-            break
+    # Lines after the first one, up to the one holding the last character
+    starts = context['line_starts']
+    for i in range(line_index_of_mark(starts, token.start_mark) + 1,
+                   line_index(starts, token.end_mark.pointer - 1) + 1):
+        line_start = starts[i]
         line_no += 1
 
         indent = 0
@@ -307,11 +307,14 @@ def check_scalar_indentation(conf, token, context):
 
 
 def _check(conf, token, prev, next, nextnext, context):
-    if 'stack' not in context:
-        context['stack'] = [Parent(ROOT, 0)]
-        context['cur_line'] = -1
+    if 'spaces' not in context:
         context['spaces'] = conf['spaces']
         context['indent-sequences'] = conf['indent-sequences']
+    # Indentation found in previous parts of the stream (when documents are
+    # linted one at a time) is kept, but not the structure.
+    if isinstance(token, yaml.StreamStartToken):
+        context['stack'] = [Parent(ROOT, 0)]
+        context['cur_line'] = -1
 
     # Step 1: Lint
 
@@ -92,42 +92,24 @@ Use this rule to prevent multiple entries with the same key in mappings.
 import yaml
 
 from yamllint.linter import LintProblem
+from yamllint.parser import MAP
 
 ID = 'key-duplicates'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.KeyToken, )
 CONF = {'forbid-duplicated-merge-keys': bool}
 DEFAULT = {'forbid-duplicated-merge-keys': False}
 
-MAP, SEQ = range(2)
-
-
-class Parent:
-    def __init__(self, type):
-        self.type = type
-        self.keys = []
-
 
 def check(conf, token, prev, next, nextnext, context):
-    if 'stack' not in context:
-        context['stack'] = []
-
-    if isinstance(token, (yaml.BlockMappingStartToken,
-                          yaml.FlowMappingStartToken)):
-        context['stack'].append(Parent(MAP))
-    elif isinstance(token, (yaml.BlockSequenceStartToken,
-                            yaml.FlowSequenceStartToken)):
-        context['stack'].append(Parent(SEQ))
-    elif isinstance(token, (yaml.BlockEndToken,
-                            yaml.FlowMappingEndToken,
-                            yaml.FlowSequenceEndToken)):
-        if len(context['stack']) > 0:
-            context['stack'].pop()
-    elif (isinstance(token, yaml.KeyToken) and
-          isinstance(next, yaml.ScalarToken)):
+    if (isinstance(token, yaml.KeyToken) and
+            isinstance(next, yaml.ScalarToken)):
         # This check is done because KeyTokens can be found inside flow
         # sequences... strange, but allowed.
-        if len(context['stack']) > 0 and context['stack'][-1].type == MAP:
-            if (next.value in context['stack'][-1].keys and
+        parent = context['structure'].current
+        if parent is not None and parent.type == MAP:
+            keys = parent.data.setdefault(ID, set())
+            if (next.value in keys and
                     # `<<` is "merge key", see http://yaml.org/type/merge.html
                     (next.value != '<<' or
                         conf['forbid-duplicated-merge-keys'])):
@@ -135,4 +117,4 @@ def check(conf, token, prev, next, nextnext, context):
                     next.start_mark.line + 1, next.start_mark.column + 1,
                     f'duplication of key "{next.value}" in mapping')
             else:
-                context['stack'][-1].keys.append(next.value)
+                keys.add(next.value)
@@ -105,52 +105,60 @@ to sort case and accents properly.
       d:
 """
 
-from locale import strcoll
+from locale import strxfrm
 import re
 
 import yaml
 
 from yamllint.linter import LintProblem
+from yamllint.parser import MAP
+from yamllint.rules.common import PatternList
 
 ID = 'key-ordering'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.KeyToken, )
 
 CONF = {'ignored-keys': [str]}
 DEFAULT = {'ignored-keys': []}
-MAP, SEQ = range(2)
 
 
-class Parent:
-    def __init__(self, type):
-        self.type = type
-        self.keys = []
+def VALIDATE(conf):
+    if not isinstance(conf['ignored-keys'], PatternList):
+        try:
+            conf['ignored-keys'] = PatternList(conf['ignored-keys'])
+        except re.error as e:
+            return f'invalid pattern in "ignored-keys": {e}'
+
+
+def collation_key(value, context):
+    # Cached for the run only: the locale can change between two runs. The
+    # cache is emptied when full, to bound memory on long streams.
+    cache = context.setdefault('collation_keys', {})
+    try:
+        return cache[value]
+    except KeyError:
+        # strxfrm() refuses null characters: the parts around them are
+        # transformed, so that null characters sort before all others
+        key = tuple(strxfrm(part) for part in value.split('\0'))
+        if len(cache) >= 4096:
+            cache.clear()
+        cache[value] = key
+        return key
 
 
 def check(conf, token, prev, next, nextnext, context):
-    if 'stack' not in context:
-        context['stack'] = []
-
-    if isinstance(token, (yaml.BlockMappingStartToken,
-                          yaml.FlowMappingStartToken)):
-        context['stack'].append(Parent(MAP))
-    elif isinstance(token, (yaml.BlockSequenceStartToken,
-                            yaml.FlowSequenceStartToken)):
-        context['stack'].append(Parent(SEQ))
-    elif isinstance(token, (yaml.BlockEndToken,
-                            yaml.FlowMappingEndToken,
-                            yaml.FlowSequenceEndToken)):
-        context['stack'].pop()
-    elif (isinstance(token, yaml.KeyToken) and
-          isinstance(next, yaml.ScalarToken)):
+    if (isinstance(token, yaml.KeyToken) and
+            isinstance(next, yaml.ScalarToken)):
         # This check is done because KeyTokens can be found inside flow
         # sequences... strange, but allowed.
-        if (len(context['stack']) > 0 and context['stack'][-1].type == MAP and
-                not any(re.search(r, next.value)
-                        for r in conf['ignored-keys'])):
-            if any(strcoll(next.value, key) < 0
-                   for key in context['stack'][-1].keys):
+        parent = context['structure'].current
+        if (parent is not None and parent.type == MAP and
+                not conf['ignored-keys'].search(next.value)):
+            key = collation_key(next.value, context)
+            # Keys accepted so far are sorted, the last one is the greatest
+            if ID in parent.data and key < parent.data[ID]:
                 yield LintProblem(
                     next.start_mark.line + 1, next.start_mark.column + 1,
                     f'wrong ordering of key "{next.value}" in mapping')
             else:
-                context['stack'][-1].keys.append(next.value)
+                parent.data[ID] = key
@@ -97,9 +97,12 @@ Use this rule to set a limit to lines length.
 """
 
 
+import re
+
 import yaml
 
 from yamllint.linter import LintProblem
+from yamllint.parser import get_line, line_index
 
 ID = 'line-length'
 TYPE = 'line'
@@ -111,18 +114,35 @@ DEFAULT = {'max': 80,
            'allow-non-breakable-inline-mappings': False}
 
 
+# The most common lines with inline mappings, `key: value` or `- key: value`
+# where value is a single plain scalar, made of printable ASCII characters.
+# They are told apart without tokenizing the line.
+INLINE_MAPPING_PATTERN = re.compile(
+    r'(?: *- +)* *(?P<key>\w[\w./-]*) *: +'
+    r"""(?P<value>(?:(?![-?:,\[\]{}#&*!|>'"%@`])[!-~]|[-?:](?=[!-~]))"""
+    r'(?:[!-9;-~]|:(?=[!-~])| +(?=[!"$-~]))*)',
+    re.ASCII)
+
+
 def check_inline_mapping(line):
-    loader = yaml.SafeLoader(line.content)
+    content = line.content
+
+    m = INLINE_MAPPING_PATTERN.fullmatch(content)
+    # (pyyaml does not look further than 1024 characters for a simple key)
+    if m is not None and m.start('value') - m.start('key') <= 1024:
+        return ' ' not in m.group('value')
+
     try:
+        loader = yaml.SafeLoader(content)
         while loader.peek_token():
             if isinstance(loader.get_token(), yaml.BlockMappingStartToken):
                 while loader.peek_token():
                     if isinstance(loader.get_token(), yaml.ValueToken):
                         t = loader.get_token()
                         if isinstance(t, yaml.ScalarToken):
-                            return (
-                                ' ' not in line.content[t.start_mark.column:])
-    except yaml.scanner.ScannerError:
+                            return ' ' not in content[t.start_mark.column:]
+    except yaml.error.YAMLError:
+        # Including non-printable characters, that make the reader fail
         pass
 
     return False
@@ -157,3 +177,12 @@ def check(conf, line):
         yield LintProblem(line.line_no, max_length + 1,
                           f'line too long'
                           f' ({length} > {max_length} characters)')
+
+
+def check_buffer(conf, buffer, starts):
+    # Lines with more than max characters (maybe counting a final '\r')
+    min_length = max(conf['max'] + 1, 0)
+    long_line = re.compile(rf'^[^\n]{{{min_length},}}', re.MULTILINE)
+    for match in long_line.finditer(buffer):
+        yield from check(conf, get_line(buffer, starts,
+                                        line_index(starts, match.start())))
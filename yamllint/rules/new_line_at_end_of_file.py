@@ -24,6 +24,7 @@ this convention too.
 
 
 from yamllint.linter import LintProblem
+from yamllint.parser import get_line
 
 ID = 'new-line-at-end-of-file'
 TYPE = 'line'
@@ -33,3 +34,8 @@ def check(conf, line):
     if line.end == len(line.buffer) and line.end > line.start:
         yield LintProblem(line.line_no, line.end - line.start + 1,
                           'no new line character at the end of file')
+
+
+def check_buffer(conf, buffer, starts):
+    # Only the last line is checked
+    yield from check(conf, get_line(buffer, starts, len(starts) - 1))
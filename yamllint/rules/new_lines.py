@@ -36,6 +36,7 @@ Use this rule to force the type of new line characters.
 from os import linesep
 
 from yamllint.linter import LintProblem
+from yamllint.parser import get_line
 
 ID = 'new-lines'
 TYPE = 'line'
@@ -56,3 +57,8 @@ def check(conf, line):
             c = repr(newline_char).strip('\'')
             yield LintProblem(1, line.end - line.start + 1,
                               f'wrong new line character: expected {c}')
+
+
+def check_buffer(conf, buffer, starts):
+    # Only the first line is checked
+    yield from check(conf, get_line(buffer, starts, 0))
@@ -70,42 +70,33 @@ converted to ``8``.
       city-code: 0o10
 """
 
-import re
-
 import yaml
 
 from yamllint.linter import LintProblem
+from yamllint.rules.common import classify_scalar
 
 ID = 'octal-values'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.ScalarToken, )
 CONF = {'forbid-implicit-octal': bool,
         'forbid-explicit-octal': bool}
 DEFAULT = {'forbid-implicit-octal': True,
            'forbid-explicit-octal': True}
 
-IS_OCTAL_NUMBER_PATTERN = re.compile(r'^[0-7]+$')
-
 
 def check(conf, token, prev, next, nextnext, context):
     if prev and isinstance(prev, yaml.tokens.TagToken):
         return
+    if not isinstance(token, yaml.tokens.ScalarToken) or token.style:
+        return
+    scalar = classify_scalar(token)
+
+    if conf['forbid-implicit-octal'] and scalar.implicit_octal:
+        yield LintProblem(
+            token.start_mark.line + 1, token.end_mark.column + 1,
+            f'forbidden implicit octal value "{token.value}"')
 
-    if conf['forbid-implicit-octal']:
-        if isinstance(token, yaml.tokens.ScalarToken):
-            if not token.style:
-                val = token.value
-                if (val.isdigit() and len(val) > 1 and val[0] == '0' and
-                        IS_OCTAL_NUMBER_PATTERN.match(val[1:])):
-                    yield LintProblem(
-                        token.start_mark.line + 1, token.end_mark.column + 1,
-                        f'forbidden implicit octal value "{token.value}"')
-
-    if conf['forbid-explicit-octal']:
-        if isinstance(token, yaml.tokens.ScalarToken):
-            if not token.style:
-                val = token.value
-                if (len(val) > 2 and val[:2] == '0o' and
-                        IS_OCTAL_NUMBER_PATTERN.match(val[2:])):
-                    yield LintProblem(
-                        token.start_mark.line + 1, token.end_mark.column + 1,
-                        f'forbidden explicit octal value "{token.value}"')
+    if conf['forbid-explicit-octal'] and scalar.explicit_octal:
+        yield LintProblem(
+            token.start_mark.line + 1, token.end_mark.column + 1,
+            f'forbidden explicit octal value "{token.value}"')
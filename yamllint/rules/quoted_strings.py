@@ -167,14 +167,17 @@ used.
     "foo:bar": baz
 """
 
+import functools
 import re
 
 import yaml
 
 from yamllint.linter import LintProblem
+from yamllint.rules.common import PatternList, classify_scalar
 
 ID = 'quoted-strings'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.ScalarToken, )
 CONF = {'quote-type': ('any', 'single', 'double', 'consistent'),
         'required': (True, False, 'only-when-needed'),
         'extra-required': [str],
@@ -196,21 +199,16 @@ def VALIDATE(conf):
         return 'cannot use both "required: true" and "extra-required"'
     if conf['required'] is False and len(conf['extra-allowed']) > 0:
         return 'cannot use both "required: false" and "extra-allowed"'
+    for option in ('extra-required', 'extra-allowed'):
+        if not isinstance(conf[option], PatternList):
+            try:
+                conf[option] = PatternList(conf[option])
+            except re.error as e:
+                return f'invalid pattern in "{option}": {e}'
 
 
 DEFAULT_SCALAR_TAG = 'tag:yaml.org,2002:str'
 
-# https://stackoverflow.com/a/36514274
-yaml.resolver.Resolver.add_implicit_resolver(
-    'tag:yaml.org,2002:int',
-    re.compile(r'''^(?:[-+]?0b[0-1_]+
-               |[-+]?0o?[0-7_]+
-               |[-+]?0[0-7_]+
-               |[-+]?(?:0|[1-9][0-9_]*)
-               |[-+]?0x[0-9a-fA-F_]+
-               |[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+)$''', re.VERBOSE),
-    list('-+0123456789'))
-
 
 def _quote_match(quote_type, token_style, context):
     if quote_type == 'consistent' and token_style is not None:
@@ -225,37 +223,40 @@ def _quote_match(quote_type, token_style, context):
             (quote_type == 'double' and token_style == '"'))
 
 
+# Characters that end a plain scalar, or cannot be in one
+_BLANK = r'\0 \t\r\n\x85\u2028\u2029'
+
+# Values that can be written as plain scalars in a block mapping (e.g.
+# `key: value`) and be read back unchanged. Following the rules of the scanner:
+# - it does not start with an indicator, except '-', '?' or ':' followed by a
+#   non-blank character,
+# - it does not contain tabs or line breaks,
+# - ':' is always followed by a non-blank character,
+# - spaces are always followed by a non-blank character other than '#'.
+PLAIN_SCALAR_PATTERN = re.compile(
+    rf"""(?:[^-?:,\[\]{{}}#&*!|>'"%@`{_BLANK}]|[-?:](?=[^{_BLANK}]))"""
+    rf'(?:[^:{_BLANK}]|:(?=[^{_BLANK}])| +(?=[^#{_BLANK}]))*')
+
+
+@functools.lru_cache(maxsize=4096)
+def _can_be_plain(value):
+    return (PLAIN_SCALAR_PATTERN.fullmatch(value) is not None and
+            yaml.reader.Reader.NON_PRINTABLE.search(value) is None)
+
+
 def _quotes_are_needed(token, is_inside_a_flow):
     # Quotes needed on strings containing flow tokens
     if is_inside_a_flow and set(token.value) & {',', '[', ']', '{', '}'}:
         return True
 
-    if token.style == '"':
-        try:
-            yaml.reader.Reader('').check_printable('key: ' + token.value)
-        except yaml.reader.ReaderError:
-            # Special characters in a double-quoted string are assumed to have
-            # been backslash-escaped
-            return True
-
-        if _has_backslash_on_at_least_one_line_ending(token):
-            return True
-
-    loader = yaml.BaseLoader('key: ' + token.value)
-    # Remove the 5 first tokens corresponding to 'key: ' (StreamStartToken,
-    # BlockMappingStartToken, KeyToken, ScalarToken(value=key), ValueToken)
-    for _ in range(5):
-        loader.get_token()
-    try:
-        a, b = loader.get_token(), loader.get_token()
-    except yaml.scanner.ScannerError:
-        return True
-    else:
-        if (isinstance(a, yaml.ScalarToken) and a.style is None and
-                isinstance(b, yaml.BlockEndToken) and a.value == token.value):
-            return False
+    if (token.style == '"' and
+            _has_backslash_on_at_least_one_line_ending(token)):
         return True
 
+    # Special characters in a double-quoted string are assumed to have been
+    # backslash-escaped: they cannot be plain either
+    return not _can_be_plain(token.value)
+
 
 def _has_quoted_quotes(token):
     return ((not token.plain) and
@@ -272,16 +273,6 @@ def _has_backslash_on_at_least_one_line_ending(token):
 
 
 def check(conf, token, prev, next, nextnext, context):
-    if 'flow_nest_count' not in context:
-        context['flow_nest_count'] = 0
-
-    if isinstance(token, (yaml.FlowMappingStartToken,
-                          yaml.FlowSequenceStartToken)):
-        context['flow_nest_count'] += 1
-    elif isinstance(token, (yaml.FlowMappingEndToken,
-                            yaml.FlowSequenceEndToken)):
-        context['flow_nest_count'] -= 1
-
     if not (isinstance(token, yaml.tokens.ScalarToken) and
             isinstance(prev, (yaml.BlockEntryToken, yaml.FlowEntryToken,
                               yaml.FlowSequenceStartToken, yaml.TagToken,
@@ -299,8 +290,7 @@ def check(conf, token, prev, next, nextnext, context):
         return
 
     # Ignore numbers, booleans, etc.
-    resolver = yaml.resolver.Resolver()
-    tag = resolver.resolve(yaml.nodes.ScalarNode, token.value, (True, False))
+    tag = classify_scalar(token).tag
     if token.plain and tag != DEFAULT_SCALAR_TAG:
         return
 
@@ -329,21 +319,17 @@ def check(conf, token, prev, next, nextnext, context):
             msg = f"string {node} is not quoted with {quote_type} quotes"
 
         elif not token.style:
-            is_extra_required = any(re.search(r, token.value)
-                                    for r in conf['extra-required'])
-            if is_extra_required:
+            if conf['extra-required'].search(token.value):
                 msg = f"string {node} is not quoted"
 
     elif conf['required'] == 'only-when-needed':
 
         # Quotes are not strictly needed here
+        is_inside_a_flow = context['structure'].flow_level > 0
         if (token.style and tag == DEFAULT_SCALAR_TAG and token.value and
-                not _quotes_are_needed(token, context['flow_nest_count'] > 0)):
-            is_extra_required = any(re.search(r, token.value)
-                                    for r in conf['extra-required'])
-            is_extra_allowed = any(re.search(r, token.value)
-                                   for r in conf['extra-allowed'])
-            if not (is_extra_required or is_extra_allowed):
+                not _quotes_are_needed(token, is_inside_a_flow)):
+            if not (conf['extra-required'].search(token.value) or
+                    conf['extra-allowed'].search(token.value)):
                 msg = (f"string {node} is redundantly quoted with "
                        f"{quote_type} quotes")
 
@@ -354,9 +340,7 @@ def check(conf, token, prev, next, nextnext, context):
             msg = f"string {node} is not quoted with {quote_type} quotes"
 
         elif not token.style:
-            is_extra_required = len(conf['extra-required']) and any(
-                re.search(r, token.value) for r in conf['extra-required'])
-            if is_extra_required:
+            if conf['extra-required'].search(token.value):
                 msg = f"string {node} is not quoted"
 
     if msg is not None:
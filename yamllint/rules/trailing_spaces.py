@@ -36,13 +36,19 @@ Use this rule to forbid trailing spaces at the end of lines.
 """  # noqa: ISC001
 
 
+import re
 import string
 
 from yamllint.linter import LintProblem
+from yamllint.parser import line_index
 
 ID = 'trailing-spaces'
 TYPE = 'line'
 
+# A space or tab starting the white space at the end of a line
+TRAILING_SPACES_PATTERN = re.compile(
+    r'(?<![ \t\r\x0b\x0c])[ \t][ \t\r\x0b\x0c]*(?=\n|\Z)')
+
 
 def check(conf, line):
     if line.end == 0:
@@ -58,3 +64,10 @@ def check(conf, line):
     if pos != line.end and line.buffer[pos] in ' \t':
         yield LintProblem(line.line_no, pos - line.start + 1,
                           'trailing spaces')
+
+
+def check_buffer(conf, buffer, starts):
+    for match in TRAILING_SPACES_PATTERN.finditer(buffer):
+        i = line_index(starts, match.start())
+        yield LintProblem(i + 1, match.start() - starts[i] + 1,
+                          'trailing spaces')
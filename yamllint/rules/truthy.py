@@ -155,6 +155,8 @@ TRUTHY_1_2 = ['TRUE', 'True', 'true',
 
 ID = 'truthy'
 TYPE = 'token'
+TOKEN_TYPES = (yaml.DirectiveToken, yaml.DocumentStartToken,
+               yaml.DocumentEndToken, yaml.ScalarToken)
 CONF = {'allowed-values': TRUTHY_1_1.copy(), 'check-keys': bool}
 DEFAULT = {'allowed-values': ['true', 'false'], 'check-keys': True}
 